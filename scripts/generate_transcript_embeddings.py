@@ -16,11 +16,13 @@ Environment Variables:
 import asyncio
 import sys
 from pathlib import Path
+from typing import Any, cast
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select, func, update
+from sqlalchemy import Row, select, func, update
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import to_tsvector
 
@@ -31,7 +33,7 @@ from services.embeddings import EmbeddingService
 
 async def generate_embeddings_for_sentence(
     session: AsyncSession,
-    sentence: TranscriptSentence,
+    sentence: Row,
     embedding: list[float],
     search_vector: str,
 ) -> None:
@@ -40,7 +42,7 @@ async def generate_embeddings_for_sentence(
 
     Args:
         session: Database session
-        sentence: TranscriptSentence model instance
+        sentence: Row with the sentence's sentence_id
         embedding: Vector embedding (768 dims)
         search_vector: Full-text search vector
     """
@@ -56,7 +58,7 @@ async def generate_embeddings_for_sentence(
 
 async def process_batch(
     session: AsyncSession,
-    sentences: list[TranscriptSentence],
+    sentences: list[Row],
     embedding_service: EmbeddingService,
 ) -> tuple[int, int]:
     """
@@ -64,7 +66,7 @@ async def process_batch(
 
     Args:
         session: Database session
-        sentences: List of transcript sentences
+        sentences: Rows of (sentence_id, full_text)
         embedding_service: Embedding service
 
     Returns:
@@ -85,7 +87,9 @@ async def process_batch(
         search_vectors = [to_tsvector("english", s.full_text) for s in sentences]
 
         # Update all sentences in batch
-        for sentence, embedding, search_vector in zip(sentences, embeddings, search_vectors):
+        for sentence, embedding, search_vector in zip(
+            sentences, embeddings, search_vectors, strict=True
+        ):
             await generate_embeddings_for_sentence(
                 session=session,
                 sentence=sentence,
@@ -121,16 +125,14 @@ async def generate_transcript_embeddings(
     session_maker = get_session_maker()
 
     async with session_maker() as session:
-        # Fetch sentences without embeddings
-        query = select(TranscriptSentence).where(TranscriptSentence.embedding.is_(None))
+        # Count sentences without embeddings
+        count_query = select(func.count(TranscriptSentence.sentence_id)).where(
+            TranscriptSentence.embedding.is_(None)
+        )
+        total_sentences = (await session.execute(count_query)).scalar() or 0
 
         if limit:
-            query = query.limit(limit)
-
-        result = await session.execute(query)
-        sentences_to_process = list(result.scalars().all())
-
-        total_sentences = len(sentences_to_process)
+            total_sentences = min(total_sentences, limit)
 
         if total_sentences == 0:
             print("No transcript sentences found without embeddings.")
@@ -149,15 +151,34 @@ async def generate_transcript_embeddings(
         print("Using local sentence-transformers model (all-mpnet-base-v2)...")
         embedding_service = EmbeddingService()
 
-        # Process in batches
+        # Process in batches, fetching each one by keyset on sentence_id so
+        # only one batch is held at a time and failed rows are skipped
         processed_total = 0
         errors_total = 0
         batch_count = 0
+        fetched = 0
+        last_sentence_id = None
+        total_batches = (total_sentences + batch_size - 1) // batch_size
+
+        while fetched < total_sentences:
+            # Only the ID and text are needed; skip hydrating full ORM rows
+            query = (
+                select(TranscriptSentence.sentence_id, TranscriptSentence.full_text)
+                .where(TranscriptSentence.embedding.is_(None))
+                .order_by(TranscriptSentence.sentence_id)
+                .limit(min(batch_size, total_sentences - fetched))
+            )
+            if last_sentence_id is not None:
+                query = query.where(TranscriptSentence.sentence_id > last_sentence_id)
+
+            result = await session.execute(query)
+            batch = list(result.all())
+            if not batch:
+                break
 
-        for i in range(0, total_sentences, batch_size):
-            batch = sentences_to_process[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (total_sentences + batch_size - 1) // batch_size
+            fetched += len(batch)
+            last_sentence_id = batch[-1].sentence_id
+            batch_num = batch_count + 1
 
             print(f"Processing batch {batch_num}/{total_batches} ({len(batch)} sentences)...")
 
@@ -172,8 +193,7 @@ async def generate_transcript_embeddings(
             batch_count += 1
 
             # Progress
-            progress = ((i + batch_size) / total_sentences) * 100
-            progress = min(progress, 100)
+            progress = min((fetched / total_sentences) * 100, 100)
             print(f"  Processed: {processed}  Errors: {errors}  Progress: {progress:.1f}%")
             print()
 
@@ -226,16 +246,14 @@ async def generate_only_fulltext_vectors(limit: int | None = None, batch_size: i
     session_maker = get_session_maker()
 
     async with session_maker() as session:
-        # Fetch sentences without search vectors
-        query = select(TranscriptSentence).where(TranscriptSentence.search_vector.is_(None))
+        # Count sentences without search vectors
+        count_query = select(func.count(TranscriptSentence.sentence_id)).where(
+            TranscriptSentence.search_vector.is_(None)
+        )
+        total_sentences = (await session.execute(count_query)).scalar() or 0
 
         if limit:
-            query = query.limit(limit)
-
-        result = await session.execute(query)
-        sentences_to_process = list(result.scalars().all())
-
-        total_sentences = len(sentences_to_process)
+            total_sentences = min(total_sentences, limit)
 
         if total_sentences == 0:
             print("No transcript sentences found without search vectors.")
@@ -250,42 +268,40 @@ async def generate_only_fulltext_vectors(limit: int | None = None, batch_size: i
 
         processed = 0
         batch_count = 0
+        total_batches = (total_sentences + batch_size - 1) // batch_size
 
-        # Process in batches
-        for i in range(0, total_sentences, batch_size):
-            batch = sentences_to_process[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (total_sentences + batch_size - 1) // batch_size
+        # Process in batches, computing each vector inside the database so
+        # sentence text never round-trips through Python
+        while processed < total_sentences:
+            batch_num = batch_count + 1
+            batch_limit = min(batch_size, total_sentences - processed)
 
             print(f"Processing batch {batch_num}/{total_batches}...")
 
-            # Generate search vectors locally
-            updates = []
-            for sentence in batch:
-                search_vector = to_tsvector("english", sentence.full_text)
-                updates.append(
-                    {
-                        "sentence_id": sentence.sentence_id,
-                        "search_vector": search_vector,
-                    }
-                )
-                processed += 1
-
-            # Batch update
-            for update_data in updates:
-                await session.execute(
-                    update(TranscriptSentence)
-                    .where(TranscriptSentence.sentence_id == update_data["sentence_id"])
-                    .values(search_vector=update_data["search_vector"])
-                )
-
+            pending_ids = (
+                select(TranscriptSentence.sentence_id)
+                .where(TranscriptSentence.search_vector.is_(None))
+                .limit(batch_limit)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                update(TranscriptSentence)
+                .where(TranscriptSentence.sentence_id.in_(pending_ids))
+                .values(search_vector=to_tsvector("english", TranscriptSentence.full_text))
+                .execution_options(synchronize_session=False)
+            )
             await session.commit()
+
+            # Bulk UPDATEs return a CursorResult, which carries the row count
+            updated = cast(CursorResult[Any], result).rowcount
+            if not updated:
+                break
+            processed += updated
             batch_count += 1
 
             # Progress
-            progress = ((i + batch_size) / total_sentences) * 100
-            progress = min(progress, 100)
-            print(f"  Processed: {len(batch)}  Progress: {progress:.1f}%")
+            progress = min((processed / total_sentences) * 100, 100)
+            print(f"  Processed: {updated}  Progress: {progress:.1f}%")
             print()
 
         print("=" * 60)
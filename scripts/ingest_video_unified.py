@@ -27,6 +27,7 @@ from core.config import get_settings
 from core.database import get_session_maker
 from parsers.order_paper_parser import OrderPaperParser
 from services.gemini import GeminiClient
+from services.llm_cache import LLMCache
 from services.unified_ingestion import UnifiedIngestionPipeline
 
 settings = get_settings()
@@ -50,6 +51,7 @@ async def ingest_video(
     no_thinking: bool,
     force: bool,
     quality: str | None,
+    cache_dir: str | None = None,
 ) -> None:
     """Ingest a single video."""
     session_maker = get_session_maker()
@@ -72,6 +74,8 @@ async def ingest_video(
             print(f"  Video Quality: {quality}")
         if verbose:
             print(f"  Verbose mode: ENABLED")
+        if cache_dir:
+            print(f"  Response cache: {cache_dir}")
         print()
 
         # Initialize Gemini client
@@ -82,6 +86,7 @@ async def ingest_video(
             temperature=0.0,
             max_output_tokens=65536,
             thinking_budget=thinking_budget,
+            cache=LLMCache(cache_dir) if cache_dir else None,
         )
 
         print(f"Using model: {gemini_client.model}")
@@ -221,6 +226,11 @@ def main():
         choices=["low", "medium", "high"],
         help="Video quality level (low, medium, high)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse Gemini responses and embeddings cached in this directory "
+        "(e.g. data/gemini_cache); disabled by default",
+    )
 
     args = parser.parse_args()
 
@@ -251,6 +261,7 @@ def main():
             no_thinking=args.no_thinking,
             force=args.force,
             quality=args.quality,
+            cache_dir=args.cache_dir,
         )
     )
 
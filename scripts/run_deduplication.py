@@ -113,6 +113,7 @@ async def run_deduplication() -> None:
             print(f"  Matches found: {stats['matches_found']}")
             print(f"  Entities merged: {stats['merged']}")
             print(f"  Kept separate: {stats['kept_separate']}")
+            print(f"  Skipped (already merged): {stats['skipped']}")
 
             if stats["errors"]:
                 print(f"\nErrors encountered:")
@@ -5,10 +5,75 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from services.gemini import GeminiClient
-from services.schemas import CHUNK_ENTITY_SCHEMA, CHUNK_RELATIONSHIP_SCHEMA
+from services.schemas import (
+    CHUNK_ENTITY_SCHEMA,
+    CHUNK_EXTRACTION_SCHEMA,
+    CHUNK_RELATIONSHIP_SCHEMA,
+)
+
+# Static parts of the extraction prompts, built once at import time
+_ENTITY_FIELDS = """1. **entity_id**: Unique slug (e.g., "bill_cybercrime_2024", "person_cummins")
+2. **entity_type**: person, organization, place, law, concept, event, numeric_fact, policy_position
+3. **name**: Name as mentioned in text
+4. **canonical_name**: Standardized version
+5. **aliases**: Alternative names/spelling variations
+6. **description**: Brief description (1-2 sentences)
+7. **mentions**: Where mentioned (sentence_index, context)
+8. **confidence**: Extraction confidence (0-1)"""
+
+_ENTITY_EXTRACTION_INSTRUCTIONS = f"""Extract entities with:
+{_ENTITY_FIELDS}
+
+Important:
+- Include speaker names as "person" entities
+- Capture laws, bills, organizations, places, concepts
+- Note any numeric facts (amounts, dates, statistics)
+- Record policy positions (stances on issues)
+- Be thorough - extract ALL entities mentioned
+"""
+
+_RELATIONSHIP_EXTRACTION_INSTRUCTIONS = """For each relationship:
+1. **source_id**: Entity or speaker ID making the statement/action
+2. **target_id**: Entity ID being referenced/acted upon
+3. **relation_type**: mentions, supports, opposes, relates_to, references, questions, answers, states
+4. **sentiment**: positive, negative, or neutral
+5. **evidence**: Direct quote from transcript
+6. **evidence_sentence_index**: Which sentence [index] contains the evidence
+7. **confidence**: Relationship confidence (0-1)
+
+Guidelines:
+- Use ONLY entity IDs and speaker names from the lists above
+- Speakers can be sources (e.g., speaker "mentions" a bill)
+- Look for: mentions, support/opposition, questions, statements of fact
+- Include sentiment based on tone (e.g., "opposes" is negative)
+- Be thorough - capture ALL relationships
+"""
+
+_COMBINED_EXTRACTION_INSTRUCTIONS = f"""Extract entities with:
+{_ENTITY_FIELDS}
+
+Then extract relationships with:
+1. **source_id**: Entity ID or speaker name making the statement/action
+2. **target_id**: Entity ID being referenced/acted upon
+3. **relation_type**: mentions, supports, opposes, relates_to, references, questions, answers, states
+4. **sentiment**: positive, negative, or neutral
+5. **evidence**: Direct quote from transcript
+6. **evidence_sentence_index**: Which sentence [index] contains the evidence
+7. **confidence**: Relationship confidence (0-1)
+
+Important:
+- Include speaker names as "person" entities
+- Capture laws, bills, organizations, places, concepts
+- Note any numeric facts (amounts, dates, statistics)
+- Record policy positions (stances on issues)
+- Relationships must use entity_ids from your entities list, or speaker names as sources
+- Look for: mentions, support/opposition, questions, statements of fact
+- Include sentiment based on tone (e.g., "opposes" is negative)
+- Be thorough - extract ALL entities and relationships
+"""
 
 
-@dataclass
+@dataclass(slots=True)
 class Sentence:
     """A single sentence with timestamp."""
 
@@ -16,7 +81,7 @@ class Sentence:
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SpeechBlock:
     """Speech by a single speaker."""
 
@@ -25,7 +90,7 @@ class SpeechBlock:
     sentences: list[Sentence] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptChunk:
     """Chunk of transcript for processing."""
 
@@ -36,7 +101,7 @@ class TranscriptChunk:
     context_summary: str = ""  # Summary of previous chunks
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkEntity:
     """Entity extracted from a chunk."""
 
@@ -51,7 +116,7 @@ class ChunkEntity:
     chunk_index: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkRelationship:
     """Relationship extracted from a chunk."""
 
@@ -73,6 +138,7 @@ class ChunkedTranscriptProcessor:
         gemini_client: GeminiClient,
         chunk_size: int = 7,
         overlap: int = 2,
+        single_pass: bool = True,
     ) -> None:
         """
         Initialize chunked processor.
@@ -81,10 +147,13 @@ class ChunkedTranscriptProcessor:
             gemini_client: Gemini client for extraction
             chunk_size: Number of sentences per chunk (default: 7)
             overlap: Number of overlapping sentences between chunks (default: 2)
+            single_pass: Extract entities and relationships in one request per chunk
+                (default: True); False uses separate entity and relationship passes
         """
         self.client = gemini_client
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.single_pass = single_pass
 
     def create_chunks(
         self,
@@ -121,8 +190,9 @@ class ChunkedTranscriptProcessor:
             if not chunk_sentences:
                 continue
 
-            # Extract unique speakers in this chunk
-            speakers = list(set(speaker for _, speaker in chunk_sentences))
+            # Extract unique speakers in this chunk, in order of first appearance
+            # (a set would reorder them per process and change the prompt text)
+            speakers = list(dict.fromkeys(speaker for _, speaker in chunk_sentences))
 
             chunk = TranscriptChunk(
                 chunk_index=len(chunks),
@@ -153,6 +223,9 @@ class ChunkedTranscriptProcessor:
         Returns:
             Tuple of (entities, relationships)
         """
+        if self.single_pass:
+            return self._extract_all_from_chunk(chunk, existing_entities)
+
         # First pass: Extract entities
         entities = self._extract_entities_from_chunk(chunk, existing_entities)
 
@@ -161,6 +234,56 @@ class ChunkedTranscriptProcessor:
 
         return entities, relationships
 
+    async def aextract_from_chunk(
+        self,
+        chunk: TranscriptChunk,
+        existing_entities: list[ChunkEntity] | None = None,
+    ) -> tuple[list[ChunkEntity], list[ChunkRelationship]]:
+        """Async variant of extract_from_chunk."""
+        if self.single_pass:
+            return await self._aextract_all_from_chunk(chunk, existing_entities)
+
+        entities = await self._aextract_entities_from_chunk(chunk, existing_entities)
+        relationships = await self._aextract_relationships_from_chunk(chunk, entities)
+
+        return entities, relationships
+
+    def _extract_all_from_chunk(
+        self,
+        chunk: TranscriptChunk,
+        existing_entities: list[ChunkEntity] | None = None,
+    ) -> tuple[list[ChunkEntity], list[ChunkRelationship]]:
+        """Extract entities and relationships from chunk in a single request."""
+        prompt = self._build_combined_extraction_prompt(chunk, existing_entities)
+
+        result = self.client.generate_structured(
+            prompt=prompt,
+            response_schema=CHUNK_EXTRACTION_SCHEMA,
+            stage="chunk_extraction",
+        )
+
+        entities = self._parse_entities(result, chunk)
+        relationships = self._parse_relationships(result, chunk, entities)
+        return entities, relationships
+
+    async def _aextract_all_from_chunk(
+        self,
+        chunk: TranscriptChunk,
+        existing_entities: list[ChunkEntity] | None = None,
+    ) -> tuple[list[ChunkEntity], list[ChunkRelationship]]:
+        """Async variant of _extract_all_from_chunk."""
+        prompt = self._build_combined_extraction_prompt(chunk, existing_entities)
+
+        result = await self.client.agenerate_structured(
+            prompt=prompt,
+            response_schema=CHUNK_EXTRACTION_SCHEMA,
+            stage="chunk_extraction",
+        )
+
+        entities = self._parse_entities(result, chunk)
+        relationships = self._parse_relationships(result, chunk, entities)
+        return entities, relationships
+
     def _extract_entities_from_chunk(
         self,
         chunk: TranscriptChunk,
@@ -175,6 +298,26 @@ class ChunkedTranscriptProcessor:
             stage="chunk_entity_extraction",
         )
 
+        return self._parse_entities(result, chunk)
+
+    async def _aextract_entities_from_chunk(
+        self,
+        chunk: TranscriptChunk,
+        existing_entities: list[ChunkEntity] | None = None,
+    ) -> list[ChunkEntity]:
+        """Async variant of _extract_entities_from_chunk."""
+        prompt = self._build_entity_extraction_prompt(chunk, existing_entities)
+
+        result = await self.client.agenerate_structured(
+            prompt=prompt,
+            response_schema=CHUNK_ENTITY_SCHEMA,
+            stage="chunk_entity_extraction",
+        )
+
+        return self._parse_entities(result, chunk)
+
+    def _parse_entities(self, result: dict[str, Any], chunk: TranscriptChunk) -> list[ChunkEntity]:
+        """Convert extracted entity records into ChunkEntity objects."""
         entities = []
         for entity_data in result.get("entities", []):
             entity = ChunkEntity(
@@ -206,6 +349,31 @@ class ChunkedTranscriptProcessor:
             stage="chunk_relationship_extraction",
         )
 
+        return self._parse_relationships(result, chunk, entities)
+
+    async def _aextract_relationships_from_chunk(
+        self,
+        chunk: TranscriptChunk,
+        entities: list[ChunkEntity],
+    ) -> list[ChunkRelationship]:
+        """Async variant of _extract_relationships_from_chunk."""
+        prompt = self._build_relationship_extraction_prompt(chunk, entities)
+
+        result = await self.client.agenerate_structured(
+            prompt=prompt,
+            response_schema=CHUNK_RELATIONSHIP_SCHEMA,
+            stage="chunk_relationship_extraction",
+        )
+
+        return self._parse_relationships(result, chunk, entities)
+
+    def _parse_relationships(
+        self,
+        result: dict[str, Any],
+        chunk: TranscriptChunk,
+        entities: list[ChunkEntity],
+    ) -> list[ChunkRelationship]:
+        """Convert extracted relationship records, dropping ones with unknown endpoints."""
         relationships = []
         entity_ids = {e.entity_id for e in entities}
 
@@ -235,6 +403,17 @@ class ChunkedTranscriptProcessor:
 
         return relationships
 
+    def _format_existing_entities(self, existing_entities: list[ChunkEntity] | None) -> str:
+        """Format the most recent previously extracted entities as prompt context."""
+        if not existing_entities:
+            return ""
+
+        # Last 10 for brevity
+        return "\n\nEntities from previous context:\n" + "".join(
+            f"- {entity.canonical_name} ({entity.entity_type})\n"
+            for entity in existing_entities[-10:]
+        )
+
     def _build_entity_extraction_prompt(
         self,
         chunk: TranscriptChunk,
@@ -247,11 +426,7 @@ class ChunkedTranscriptProcessor:
         )
 
         # Format existing entities for context
-        existing_text = ""
-        if existing_entities:
-            existing_text = "\n\nEntities from previous context:\n"
-            for entity in existing_entities[-10:]:  # Last 10 for brevity
-                existing_text += f"- {entity.canonical_name} ({entity.entity_type})\n"
+        existing_text = self._format_existing_entities(existing_entities)
 
         prompt = f"""Extract ALL entities mentioned in this parliamentary transcript chunk.
 
@@ -265,23 +440,7 @@ Sentences:
 {sentences_text}
 {existing_text}
 
-Extract entities with:
-1. **entity_id**: Unique slug (e.g., "bill_cybercrime_2024", "person_cummins")
-2. **entity_type**: person, organization, place, law, concept, event, numeric_fact, policy_position
-3. **name**: Name as mentioned in text
-4. **canonical_name**: Standardized version
-5. **aliases**: Alternative names/spelling variations
-6. **description**: Brief description (1-2 sentences)
-7. **mentions**: Where mentioned (sentence_index, context)
-8. **confidence**: Extraction confidence (0-1)
-
-Important:
-- Include speaker names as "person" entities
-- Capture laws, bills, organizations, places, concepts
-- Note any numeric facts (amounts, dates, statistics)
-- Record policy positions (stances on issues)
-- Be thorough - extract ALL entities mentioned
-"""
+{_ENTITY_EXTRACTION_INSTRUCTIONS}"""
 
         return prompt
 
@@ -317,22 +476,38 @@ Entities (use ONLY these IDs):
 Speakers (can be relationship sources):
 {speakers_text}
 
-For each relationship:
-1. **source_id**: Entity or speaker ID making the statement/action
-2. **target_id**: Entity ID being referenced/acted upon
-3. **relation_type**: mentions, supports, opposes, relates_to, references, questions, answers, states
-4. **sentiment**: positive, negative, or neutral
-5. **evidence**: Direct quote from transcript
-6. **evidence_sentence_index**: Which sentence [index] contains the evidence
-7. **confidence**: Relationship confidence (0-1)
+{_RELATIONSHIP_EXTRACTION_INSTRUCTIONS}"""
 
-Guidelines:
-- Use ONLY entity IDs and speaker names from the lists above
-- Speakers can be sources (e.g., speaker "mentions" a bill)
-- Look for: mentions, support/opposition, questions, statements of fact
-- Include sentiment based on tone (e.g., "opposes" is negative)
-- Be thorough - capture ALL relationships
-"""
+        return prompt
+
+    def _build_combined_extraction_prompt(
+        self,
+        chunk: TranscriptChunk,
+        existing_entities: list[ChunkEntity] | None = None,
+    ) -> str:
+        """Build prompt for joint entity and relationship extraction from chunk."""
+        # Format sentences
+        sentences_text = "\n".join(
+            f"[{i}] ({s.start_time}): {s.text}" for i, s in enumerate(chunk.sentences)
+        )
+
+        # Format existing entities for context
+        existing_text = self._format_existing_entities(existing_entities)
+
+        prompt = f"""Extract ALL entities mentioned in this parliamentary transcript chunk, \
+then ALL relationships between them.
+
+Agenda Item: {chunk.agenda_item_title}
+Speakers: {", ".join(chunk.speaker_names)}
+
+Previous Context Summary:
+{chunk.context_summary}
+
+Sentences:
+{sentences_text}
+{existing_text}
+
+{_COMBINED_EXTRACTION_INSTRUCTIONS}"""
 
         return prompt
 
@@ -355,16 +530,66 @@ Guidelines:
             speech_blocks: List of speech blocks
 
         Returns:
-            Tuple of (all entities, all relationships)
+            Tuple of (all entities, unique by entity_id, and all relationships)
         """
         chunks = self.create_chunks(agenda_item_title, speech_blocks)
 
         all_entities: list[ChunkEntity] = []
+        entities_by_id: dict[str, ChunkEntity] = {}
         all_relationships: list[ChunkRelationship] = []
 
         for chunk in chunks:
             entities, relationships = self.extract_from_chunk(chunk, all_entities)
-            all_entities.extend(entities)
+            self._add_entities(entities, all_entities, entities_by_id)
+            all_relationships.extend(relationships)
+
+        return all_entities, all_relationships
+
+    def _add_entities(
+        self,
+        entities: list[ChunkEntity],
+        all_entities: list[ChunkEntity],
+        entities_by_id: dict[str, ChunkEntity],
+    ) -> None:
+        """
+        Add chunk entities to the running list, keeping one entry per entity_id.
+
+        Overlapping chunks re-extract the same entities; repeats are folded
+        into the first occurrence by merging their aliases and mentions.
+        """
+        for entity in entities:
+            existing = entities_by_id.get(entity.entity_id)
+            if existing is None:
+                entities_by_id[entity.entity_id] = entity
+                all_entities.append(entity)
+                continue
+
+            for alias in entity.aliases:
+                if alias not in existing.aliases:
+                    existing.aliases.append(alias)
+            existing.mentions.extend(entity.mentions)
+
+    async def aprocess_transcript(
+        self,
+        agenda_item_title: str,
+        speech_blocks: list[SpeechBlock],
+    ) -> tuple[list[ChunkEntity], list[ChunkRelationship]]:
+        """
+        Async variant of process_transcript.
+
+        Chunks are still extracted in order, since each prompt includes the
+        entities found in earlier chunks; callers can run several agenda
+        items concurrently.
+        """
+        chunks = self.create_chunks(agenda_item_title, speech_blocks)
+
+        all_entities: list[ChunkEntity] = []
+        entities_by_id: dict[str, ChunkEntity] = {}
+        all_relationships: list[ChunkRelationship] = []
+
+        for chunk in chunks:
+            entities, relationships = await self.aextract_from_chunk(chunk, all_entities)
+            self._add_entities(entities, all_entities, entities_by_id)
             all_relationships.extend(relationships)
 
         return all_entities, all_relationships
@@ -1,18 +1,29 @@
 """Vector embeddings service"""
 
+from collections import OrderedDict
+from typing import Any, cast
+
 from services.gemini import GeminiClient
 
 
 class EmbeddingService:
     """Service for generating vector embeddings."""
 
-    def __init__(self, gemini_client: GeminiClient | None = None) -> None:
+    def __init__(
+        self,
+        gemini_client: GeminiClient | None = None,
+        cache_size: int = 4096,
+    ) -> None:
         """Initialize embedding service.
 
         Args:
             gemini_client: Optional Gemini client (if None, will use sentence-transformers)
+            cache_size: Number of text embeddings to keep in memory (0 disables caching)
         """
         self.gemini_client = gemini_client
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._model: Any = None  # SentenceTransformer, loaded on first use
         if gemini_client:
             self.model_name = "text-embedding-004"  # v1beta compatible model
             self.model_version = "gemini"
@@ -33,28 +44,51 @@ class EmbeddingService:
         Returns:
             List of embedding vectors (768 dimensions each)
         """
+        # Serve repeated texts (speaker names, recurring entities) from memory
+        found: dict[str, list[float]] = {}
+        for text in texts:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                found[text] = self._cache[text]
+
+        missing = list(dict.fromkeys(text for text in texts if text not in found))
+        if missing:
+            fresh = dict(zip(missing, self._embed(missing), strict=True))
+            found.update(fresh)
+            if self.cache_size > 0:
+                self._cache.update(fresh)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [found[text] for text in texts]
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with the configured backend, bypassing the cache."""
         if self.gemini_client:
-            return self.gemini_client.embed_texts(texts)
-
-        try:
-            from sentence_transformers import SentenceTransformer
-
-            model_name = "all-mpnet-base-v2"
-            model = SentenceTransformer(model_name)
-
-            all_embeddings = model.encode(
-                texts,
-                convert_to_numpy=True,
-                show_progress_bar=False,
-            )
-
-            return all_embeddings.tolist()
-
-        except ImportError:
-            raise ImportError(
-                "sentence-transformers not installed. "
-                "Install with: pip install sentence-transformers"
-            ) from None
+            return cast(list[list[float]], self.gemini_client.embed_texts(texts).tolist())
+
+        all_embeddings = self._get_model().encode(
+            texts,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+        return cast(list[list[float]], all_embeddings.tolist())
+
+    def _get_model(self) -> Any:
+        """Load the sentence-transformers model once and reuse it for every batch."""
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                raise ImportError(
+                    "sentence-transformers not installed. "
+                    "Install with: pip install sentence-transformers"
+                ) from None
+
+            self._model = SentenceTransformer(self.model_name)
+
+        return self._model
 
     def generate_batch(
         self,
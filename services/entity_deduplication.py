@@ -1,13 +1,15 @@
 """Global entity deduplication service using batch processing."""
 
+import asyncio
 import json
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
-from sqlalchemy import select, func
+from rapidfuzz import fuzz, process
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from thefuzz import fuzz
 
 from core.config import get_settings
 from models.entity import Entity
@@ -17,8 +19,11 @@ from services.schemas import DEDUPLICATION_SCHEMA
 
 settings = get_settings()
 
+# Slack for float32 score comparisons against the (float64) thresholds
+SCORE_TOLERANCE = 1e-6
 
-@dataclass
+
+@dataclass(slots=True)
 class EntityMatch:
     """Potential entity match for deduplication."""
 
@@ -40,6 +45,9 @@ class EntityDeduplicationService:
     4. Remap relationship references
     """
 
+    # Entities scored per block when searching for candidate pairs
+    SCORE_BLOCK_SIZE = 256
+
     def __init__(
         self,
         session: AsyncSession,
@@ -49,6 +57,7 @@ class EntityDeduplicationService:
         hybrid_threshold: float = 0.80,
         batch_size: int = 100,
         embedding_service: EmbeddingService | None = None,
+        max_concurrent_resolutions: int = 8,
     ) -> None:
         """
         Initialize deduplication service.
@@ -61,6 +70,7 @@ class EntityDeduplicationService:
             hybrid_threshold: Minimum hybrid score (0-1)
             batch_size: Number of entities to process per batch
             embedding_service: Embedding service (if None, creates one)
+            max_concurrent_resolutions: Maximum LLM resolution requests in flight at once
         """
         self.session = session
         self.gemini_client = gemini_client
@@ -69,6 +79,7 @@ class EntityDeduplicationService:
         self.hybrid_threshold = hybrid_threshold
         self.batch_size = batch_size
         self.embedding_service = embedding_service or EmbeddingService()
+        self.max_concurrent_resolutions = max_concurrent_resolutions
 
     async def run_deduplication(self) -> dict[str, Any]:
         """
@@ -77,12 +88,13 @@ class EntityDeduplicationService:
         Returns:
             Statistics about the deduplication process
         """
-        stats = {
+        stats: dict[str, Any] = {
             "entities_processed": 0,
             "pairs_checked": 0,
             "matches_found": 0,
             "merged": 0,
             "kept_separate": 0,
+            "skipped": 0,
             "errors": [],
         }
 
@@ -102,14 +114,36 @@ class EntityDeduplicationService:
             stats["pairs_checked"] = len(candidate_pairs)
 
             # Process candidate pairs in batches
+            semaphore = asyncio.Semaphore(self.max_concurrent_resolutions)
+
+            async def resolve(match: EntityMatch) -> dict[str, Any]:
+                async with semaphore:
+                    return await self._resolve_match(match)
+
+            # Entities merged away so far; pairs involving them are stale
+            merged_ids: set[str] = set()
+
+            def is_stale(match: EntityMatch) -> bool:
+                return (
+                    match.entity1.entity_id in merged_ids or match.entity2.entity_id in merged_ids
+                )
+
             for i in range(0, len(candidate_pairs), self.batch_size):
                 batch = candidate_pairs[i : i + self.batch_size]
+                pending = [match for match in batch if not is_stale(match)]
+                stats["entities_processed"] += len(batch)
+                stats["skipped"] += len(batch) - len(pending)
 
-                for match in batch:
-                    stats["entities_processed"] += 1
+                # Resolve ambiguous matches with LLM concurrently; merges below
+                # touch the session, so they are still applied one at a time
+                decisions = await asyncio.gather(*(resolve(match) for match in pending))
 
-                    # Resolve ambiguous matches with LLM
-                    decision = await self._resolve_match(match)
+                for match, decision in zip(pending, decisions, strict=True):
+                    # Decisions were made concurrently, so a pair may involve an
+                    # entity that an earlier decision in this batch merged away
+                    if is_stale(match):
+                        stats["skipped"] += 1
+                        continue
 
                     if decision["decision"] == "merge":
                         await self._merge_entities(
@@ -117,6 +151,7 @@ class EntityDeduplicationService:
                             match.entity2,
                             decision,
                         )
+                        merged_ids.add(match.entity2.entity_id)
                         stats["merged"] += 1
                     else:
                         stats["kept_separate"] += 1
@@ -154,7 +189,7 @@ class EntityDeduplicationService:
             embeddings = self.embedding_service.generate_embeddings(texts)
 
             # Assign embeddings
-            for entity, embedding in zip(batch, embeddings):
+            for entity, embedding in zip(batch, embeddings, strict=True):
                 entity.embedding = embedding
 
         await self.session.flush()
@@ -167,78 +202,125 @@ class EntityDeduplicationService:
         """
         candidate_pairs = []
 
-        # Compare each entity with entities created after it
-        # (to avoid duplicate comparisons and maintain ordering)
-        for i, entity1 in enumerate(entities):
-            for entity2 in entities[i + 1 :]:
-                # Only compare entities of the same type
-                if entity1.entity_type != entity2.entity_type:
-                    continue
-
-                # Calculate fuzzy score
-                fuzzy_score = self._calculate_fuzzy_score(entity1, entity2)
-
-                # Calculate vector score if both have embeddings
-                vector_score = 0.0
-                if entity1.embedding and entity2.embedding:
-                    vector_score = self._calculate_vector_similarity(
-                        entity1.embedding, entity2.embedding
-                    )
-
-                # Calculate hybrid score
-                hybrid_score = (0.3 * fuzzy_score) + (0.7 * vector_score)
-
-                # Check if this pair meets thresholds
-                if (
-                    fuzzy_score >= self.fuzzy_threshold
-                    or vector_score >= self.vector_threshold
-                    or hybrid_score >= self.hybrid_threshold
-                ):
-                    match = EntityMatch(
-                        entity1=entity1,
-                        entity2=entity2,
-                        fuzzy_score=fuzzy_score,
-                        vector_score=vector_score,
-                        hybrid_score=hybrid_score,
+        # Only entities of the same type are compared
+        entities_by_type: dict[str, list[Entity]] = {}
+        for entity in entities:
+            entities_by_type.setdefault(entity.entity_type, []).append(entity)
+
+        for group in entities_by_type.values():
+            if len(group) < 2:
+                continue
+
+            # Scores are produced one block of rows at a time; only pairs that
+            # pass a threshold are kept, so no full score matrix is ever built.
+            # Vector score is 0 unless both have embeddings
+            for (start, fuzzy_block), (_, vector_block) in zip(
+                self._fuzzy_score_blocks(group), self._vector_similarity_blocks(group), strict=True
+            ):
+                # Kept in float32 like the inputs; thresholds are compared with a
+                # small tolerance so float32 rounding never drops a pair
+                hybrid_block = np.float32(0.3) * fuzzy_block + np.float32(0.7) * vector_block
+
+                # Pairs meeting any threshold, each compared once with an entity
+                # created after it (upper triangle keeps the original ordering)
+                candidates = np.triu(
+                    (fuzzy_block >= self.fuzzy_threshold - SCORE_TOLERANCE)
+                    | (vector_block >= self.vector_threshold - SCORE_TOLERANCE)
+                    | (hybrid_block >= self.hybrid_threshold - SCORE_TOLERANCE),
+                    k=1,
+                )
+                for row, col in zip(*np.nonzero(candidates), strict=True):
+                    candidate_pairs.append(
+                        EntityMatch(
+                            entity1=group[start + row],
+                            entity2=group[start + col],
+                            fuzzy_score=float(fuzzy_block[row, col]),
+                            vector_score=float(vector_block[row, col]),
+                            hybrid_score=float(hybrid_block[row, col]),
+                        )
                     )
-                    candidate_pairs.append(match)
 
         # Sort by hybrid score (highest first)
         candidate_pairs.sort(key=lambda m: m.hybrid_score, reverse=True)
 
         return candidate_pairs
 
-    def _calculate_fuzzy_score(self, entity1: Entity, entity2: Entity) -> float:
-        """Calculate fuzzy matching score between two entities."""
-        # Check canonical names
-        names_to_check1 = [entity1.canonical_name, entity1.name] + entity1.aliases
-        names_to_check2 = [entity2.canonical_name, entity2.name] + entity2.aliases
-
-        best_score = 0.0
-        for name1 in names_to_check1:
-            for name2 in names_to_check2:
-                score = fuzz.ratio(name1.lower(), name2.lower()) / 100.0
-                best_score = max(best_score, score)
-
-        return best_score
-
-    def _calculate_vector_similarity(
-        self,
-        embedding1: list[float],
-        embedding2: list[float],
-    ) -> float:
-        """Calculate cosine similarity between two embeddings."""
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+    def _fuzzy_score_blocks(
+        self, entities: list[Entity], block_size: int | None = None
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Yield pairwise fuzzy scores between entities, one block of rows at a time.
+
+        Each item is (start, scores) where scores[r, c] compares entities
+        start + r and start + c, covering rows start..start + block_size and
+        every entity from start onwards (the upper triangle and diagonal), so
+        memory is bounded by block_size x len(entities). Names and aliases are
+        scored with a native cdist call per block, and the best score per
+        entity pair is taken with reduceat over each entity's contiguous names.
+        Scores are in [0, 1]. Blank names are skipped, since rapidfuzz scores
+        two empty strings as a perfect match; an entity with no usable name
+        keeps a single placeholder column that scores 0 against everything.
+        """
+        block_size = block_size or self.SCORE_BLOCK_SIZE
+        names: list[str] = []
+        offsets: list[int] = []
+        for entity in entities:
+            offsets.append(len(names))
+            entity_names = [
+                name
+                for name in (entity.canonical_name, entity.name, *entity.aliases)
+                if name and name.strip()
+            ]
+            # reduceat needs at least one column per entity
+            names.extend(entity_names or [""])
+        bounds = offsets + [len(names)]
+        placeholders = np.array([not name for name in names])
+
+        for start in range(0, len(entities), block_size):
+            stop = min(start + block_size, len(entities))
+            first = bounds[start]
+            scores = process.cdist(
+                names[first : bounds[stop]],
+                names[first:],
+                scorer=fuzz.ratio,
+                processor=str.lower,
+                dtype=np.float32,
+                workers=-1,
+            )
+            scores[placeholders[first : bounds[stop]]] = 0
+            scores[:, placeholders[first:]] = 0
+            row_offsets = [offset - first for offset in offsets[start:stop]]
+            col_offsets = [offset - first for offset in offsets[start:]]
+            best = np.maximum.reduceat(
+                np.maximum.reduceat(scores, row_offsets, axis=0), col_offsets, axis=1
+            )
+            yield start, best / 100.0
 
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+    def _vector_similarity_blocks(
+        self, entities: list[Entity], block_size: int | None = None
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Yield pairwise cosine similarities between entity embeddings in row blocks.
 
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Blocks match _fuzzy_score_blocks: rows start..start + block_size against
+        every entity from start onwards. Rows are L2-normalized once, so each
+        block is a single matrix product. Entities without an embedding get
+        similarity 0 with everything.
+        """
+        block_size = block_size or self.SCORE_BLOCK_SIZE
+        dimensions = next(
+            (len(e.embedding) for e in entities if e.embedding is not None and len(e.embedding)),
+            0,
+        )
+        matrix = np.zeros((len(entities), dimensions), dtype=np.float32)
+        for row, entity in enumerate(entities):
+            if entity.embedding is not None and len(entity.embedding):
+                matrix[row] = entity.embedding
 
-        return float(dot_product / (norm1 * norm2))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        for start in range(0, len(entities), block_size):
+            yield start, matrix[start : start + block_size] @ matrix[start:].T
 
     async def _resolve_match(self, match: EntityMatch) -> dict[str, Any]:
         """
@@ -249,7 +331,7 @@ class EntityDeduplicationService:
         """
         prompt = self._build_deduplication_prompt(match)
 
-        result = self.gemini_client.generate_structured(
+        result = await self.gemini_client.agenerate_structured(
             prompt=prompt,
             response_schema=DEDUPLICATION_SCHEMA,
             stage="entity_deduplication",
@@ -379,12 +461,14 @@ Make your decision and explain your reasoning.
         Returns:
             Dict mapping old entity IDs to new canonical IDs
         """
-        result = await self.session.execute(select(Entity).where(Entity.meta_data.isnot(None)))
-        entities = result.scalars().all()
+        # Only the two columns needed, not full rows with embeddings
+        result = await self.session.execute(
+            select(Entity.entity_id, Entity.meta_data).where(Entity.meta_data.isnot(None))
+        )
 
         id_mapping = {}
-        for entity in entities:
-            if entity.meta_data and "merged_into" in entity.meta_data:
-                id_mapping[entity.entity_id] = entity.meta_data["merged_into"]
+        for entity_id, meta_data in result:
+            if meta_data and "merged_into" in meta_data:
+                id_mapping[entity_id] = meta_data["merged_into"]
 
         return id_mapping
@@ -1,19 +1,27 @@
 """Gemini API client wrapper for vision and text generation."""
 
+import asyncio
+import hashlib
 import json
+import operator
 import os
+import random
 import signal
 import time
-from collections import deque
-from functools import wraps
-from typing import Callable, ParamSpec, TypeVar
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 from pathlib import Path
-from typing import Any, Iterable, cast
+from typing import Any, cast
 
+import numpy as np
+import orjson
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
-P = ParamSpec("P")
+from services.llm_cache import LLMCache
+
 R = TypeVar("R")
 
 
@@ -27,43 +35,184 @@ class RateLimiter:
         # Buffer size is 2x max_calls to allow for expired call filtering
         self.calls: deque[float] = deque(maxlen=max_calls * 2)
 
-    def wait_if_needed(self) -> None:
+    def _reserve(self) -> float:
+        """Record a call and return how long the caller must wait before making it."""
         now = time.time()
         # Remove expired calls from the left side of the deque
         while self.calls and now - self.calls[0] >= self.period:
             self.calls.popleft()
+        slot = now
         if len(self.calls) >= self.max_calls:
-            sleep_time = self.period - (now - self.calls[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        self.calls.append(now)
-
+            # Queued reservations hold future slots, so space this one a full
+            # period after the call max_calls places back rather than after calls[0]
+            slot = max(now, self.calls[-self.max_calls] + self.period)
+        self.calls.append(slot)
+        return slot - now
 
-def rate_limit(limiter: RateLimiter) -> Callable[[Callable[P, R]], Callable[P, R]]:
-    """Decorator to apply rate limiting to a function."""
+    def wait_if_needed(self) -> None:
+        sleep_time = self._reserve()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
-    def decorator(func: Callable[P, R]) -> Callable[P, R]:
-        @wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            limiter.wait_if_needed()
-            return func(*args, **kwargs)
+    async def async_wait_if_needed(self) -> None:
+        sleep_time = self._reserve()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
 
-        return wrapper
 
-    return decorator
+_rate_limiter = RateLimiter()
 
 
-_rate_limiter = RateLimiter()
+_USAGE_FIELDS = (
+    "prompt_token_count",
+    "candidates_token_count",
+    "total_token_count",
+    "cached_content_token_count",
+)
+_get_usage_counts = operator.attrgetter(*_USAGE_FIELDS)
+
+
+@dataclass(slots=True, frozen=True)
+class TokenUsage:
+    """Token counts reported for a single Gemini call."""
+
+    prompt_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cached_tokens: int = 0  # Prompt tokens served from Gemini's (implicit) context cache
+
+
+def _sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_retry_delay(value: str) -> float | None:
+    """Parse a server-requested delay in seconds, ignoring malformed, negative or NaN values."""
+    try:
+        delay = float(value)
+    except ValueError:
+        return None
+    # NaN fails every comparison, so this rejects it along with negatives
+    return delay if delay >= 0 else None
+
+
+class _ArrayElementScanner:
+    """
+    Incrementally extract object elements of one top-level array from streamed JSON.
+
+    Text is fed in arbitrary chunks; each call returns the elements of
+    ``{"<key>": [{...}, {...}]}`` that were completed by that chunk. Only
+    string state and nesting depth are tracked, so every character is
+    scanned once and no partial document is ever re-parsed.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._in_target = False
+        self._element_start: int | None = None
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Consume a chunk of text and return any newly completed elements."""
+        self._text += chunk
+        text = self._text
+        elements: list[dict[str, Any]] = []
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        # At depth 1 the string preceding "[" is always that value's key
+                        self._last_string = text[self._string_start + 1 : i]
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 2 and c == "[" and self._last_string == self.key:
+                    self._in_target = True
+                elif self._in_target and self._depth == 3 and self._element_start is None:
+                    self._element_start = i
+            elif c in "}]":
+                self._depth -= 1
+                if self._in_target and self._depth == 2 and self._element_start is not None:
+                    elements.append(orjson.loads(text[self._element_start : i + 1]))
+                    self._element_start = None
+                elif self._in_target and self._depth == 1:
+                    self._in_target = False
+
+        # Drop text that can no longer be part of an element or key
+        keep_from = len(text)
+        if self._element_start is not None:
+            keep_from = self._element_start
+        elif self._in_string:
+            keep_from = self._string_start
+        self._text = text[keep_from:]
+        self._pos = len(self._text)
+        if self._element_start is not None:
+            self._element_start -= keep_from
+        self._string_start -= keep_from
+        return elements
 
 
 class GeminiClient:
     """Wrapper for Google Gemini API operations."""
 
-    # Retry configuration for JSON parsing errors
+    __slots__ = (
+        "api_key",
+        "model",
+        "temperature",
+        "max_output_tokens",
+        "thinking_budget",
+        "timeout_seconds",
+        "cache",
+        "client",
+        "usage_log",
+        "_file_cache",
+        "_config_cache",
+    )
+
+    # Retry configuration for malformed JSON and transient API errors
     MAX_RETRIES = 3
-    RETRY_DELAY_BASE = 2  # seconds (doubles each retry)
+    RETRY_DELAY_BASE = 2  # seconds (doubles each retry, plus jitter)
+    MAX_RETRY_DELAY = 60  # seconds
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
     DEFAULT_TIMEOUT_SECONDS = 300  # 5 minutes default timeout
 
+    # Embedding batching (embed_content accepts at most 100 texts per request)
+    EMBED_BATCH_SIZE = 100
+    EMBED_MAX_CONCURRENCY = 8
+
+    # Uploaded files are kept by Gemini for 48 hours; reuse handles for a bit less
+    UPLOAD_TTL_SECONDS = 47 * 60 * 60
+    # Expired uploads surface as a 404, or as a 403 whose message names the file
+    # ("You do not have permission to access the File ... or it may not exist")
+    STALE_FILE_STATUS_CODE = 404
+    STALE_FILE_FORBIDDEN_CODE = 403
+
+    # Most recent usage records kept in memory
+    USAGE_LOG_MAXLEN = 10_000
+
+    # Generation configs memoized per schema object
+    CONFIG_CACHE_SIZE = 16
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -72,6 +221,7 @@ class GeminiClient:
         max_output_tokens: int = 65536,
         thinking_budget: int | None = None,
         timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS,
+        cache: LLMCache | None = None,
     ):
         """
         Initialize Gemini client.
@@ -83,6 +233,7 @@ class GeminiClient:
             max_output_tokens: Maximum tokens in response (default: 65536 for gemini-2.5-flash)
             thinking_budget: Thinking budget in tokens (0=no thinking, -1=model controls, 1-24576=specific budget, None=default)
             timeout_seconds: API request timeout in seconds (default: 300)
+            cache: Optional response cache for deterministic (temperature 0) requests
         """
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
@@ -93,44 +244,58 @@ class GeminiClient:
         self.max_output_tokens = max_output_tokens
         self.thinking_budget = thinking_budget
         self.timeout_seconds = timeout_seconds
+        self.cache = cache
         self.client = genai.Client(api_key=self.api_key)
-        self.usage_log: list[dict[str, Any]] = []
+        # Bounded so long-running processes don't accumulate records forever
+        self.usage_log: deque[dict[str, Any]] = deque(maxlen=self.USAGE_LOG_MAXLEN)
+        self._file_cache: dict[str, tuple[Any, float]] = {}
+        self._config_cache: OrderedDict[tuple, tuple[dict | None, types.GenerateContentConfig]] = (
+            OrderedDict()
+        )
 
-    def _extract_usage(self, response: Any) -> dict[str, int] | None:
+    def _extract_usage(self, response: Any) -> TokenUsage | None:
         usage = getattr(response, "usage_metadata", None)
         if usage is None:
             usage = getattr(response, "usage", None)
         if usage is None:
             return None
 
-        if isinstance(usage, dict):
-            prompt_tokens = usage.get("prompt_token_count")
-            output_tokens = usage.get("candidates_token_count")
-            total_tokens = usage.get("total_token_count")
-        else:
-            prompt_tokens = getattr(usage, "prompt_token_count", None)
-            output_tokens = getattr(usage, "candidates_token_count", None)
-            total_tokens = getattr(usage, "total_token_count", None)
+        try:
+            # SDK usage metadata always carries all three fields
+            prompt_tokens, output_tokens, total_tokens, cached_tokens = _get_usage_counts(usage)
+        except AttributeError:
+            if isinstance(usage, dict):
+                prompt_tokens, output_tokens, total_tokens, cached_tokens = map(
+                    usage.get, _USAGE_FIELDS
+                )
+            else:
+                prompt_tokens, output_tokens, total_tokens, cached_tokens = (
+                    getattr(usage, field, None) for field in _USAGE_FIELDS
+                )
 
-        if prompt_tokens is None and output_tokens is None and total_tokens is None:
+        if prompt_tokens is output_tokens is total_tokens is None:
             return None
 
-        return {
-            "prompt_tokens": int(prompt_tokens or 0),
-            "output_tokens": int(output_tokens or 0),
-            "total_tokens": int(total_tokens or 0),
-        }
+        return TokenUsage(
+            prompt_tokens=int(prompt_tokens or 0),
+            output_tokens=int(output_tokens or 0),
+            total_tokens=int(total_tokens or 0),
+            cached_tokens=int(cached_tokens or 0),
+        )
 
     def _record_usage(self, response: Any, stage: str, duration_ms: float) -> None:
         usage = self._extract_usage(response)
-        if not usage:
+        if usage is None:
             return
         self.usage_log.append(
             {
                 "stage": stage,
                 "model": self.model,
                 "duration_ms": duration_ms,
-                **usage,
+                "prompt_tokens": usage.prompt_tokens,
+                "output_tokens": usage.output_tokens,
+                "total_tokens": usage.total_tokens,
+                "cached_tokens": usage.cached_tokens,
             }
         )
 
@@ -149,8 +314,8 @@ class GeminiClient:
             json.JSONDecodeError: With enhanced error message showing response preview
         """
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as e:
+            return orjson.loads(response_text)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
             # Enhance error message with response preview for debugging
             response_len = len(response_text)
             preview_length = 500
@@ -172,107 +337,102 @@ class GeminiClient:
             print(error_msg)  # Log for debugging
             raise  # Re-raise as original exception
 
-    @rate_limit(_rate_limiter)
-    def analyze_pdf_with_vision(
+    def _parse_response(
         self,
-        pdf_path: Path,
-        prompt: str,
-        response_schema: dict | None = None,
-        stage: str = "pdf_vision",
+        response: Any,
+        response_schema: dict | None,
+        context: str = "",
     ) -> dict[str, Any]:
         """
-        Analyze a PDF using Gemini vision with optional structured output.
+        Return the JSON payload of a response.
+
+        With a response schema Gemini uses constrained decoding and the SDK has
+        already decoded the output into ``response.parsed``, so the raw text is
+        only parsed when no schema was supplied.
 
         Args:
-            pdf_path: Path to PDF file
-            prompt: Instruction prompt for analysis
-            response_schema: Optional JSON schema for structured output
+            response: Response returned by ``generate_content``
+            response_schema: Schema the request was made with (if any)
+            context: Context string for error messages
 
         Returns:
-            Parsed JSON response from model
+            Parsed JSON dictionary
         """
-        # Upload the PDF file
-        uploaded_file = self.client.files.upload(file=str(pdf_path))
-
-        # Prepare generation config
-        config_kwargs: dict[str, Any] = {
-            "temperature": self.temperature,
-            "max_output_tokens": self.max_output_tokens,
-        }
-        if response_schema:
-            config_kwargs["response_mime_type"] = "application/json"
-            config_kwargs["response_schema"] = response_schema
-
-        # Add thinking config if thinking_budget is specified
-        if self.thinking_budget is not None:
-            config_kwargs["thinking_config"] = types.ThinkingConfig(
-                thinking_budget=self.thinking_budget,
-                include_thoughts=False,  # Don't include thinking in output
-            )
-
-        generation_config = types.GenerateContentConfig(**config_kwargs)
-
-        # Retry logic for transient failures with timeout
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                # Generate content with timeout protection
-                start_time = time.perf_counter()
-                # Note: timeout is enforced by the client's HTTP configuration
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=[prompt, uploaded_file],
-                    config=generation_config,
-                )
-                duration_ms = (time.perf_counter() - start_time) * 1000
-                self._record_usage(response, stage=stage, duration_ms=duration_ms)
-
-                # Parse response with enhanced error messages
-                return self._safe_json_parse(response.text or "", context="PDF vision analysis")
+        if response_schema is not None:
+            parsed = getattr(response, "parsed", None)
+            if isinstance(parsed, dict):
+                return parsed
+        return self._safe_json_parse(response.text or "", context=context)
+
+    @property
+    def caching_enabled(self) -> bool:
+        """
+        Whether generation responses are served from the cache.
 
-            except json.JSONDecodeError:
-                if attempt < self.MAX_RETRIES:
-                    delay = self.RETRY_DELAY_BASE * attempt
-                    time.sleep(delay)
-                else:
-                    # Final failure - re-raise
-                    raise
+        Only deterministic generations are cached: with a non-zero temperature
+        repeated requests are expected to produce different outputs.
+        """
+        return self.cache is not None and self.temperature <= 0
 
-        raise RuntimeError("Failed to analyze PDF with Gemini")
+    def _cache_key(self, kind: str, **request: Any) -> str | None:
+        """Return the cache key for a request, or None if it must not be cached."""
+        if not self.caching_enabled:
+            return None
+        return LLMCache.make_key(
+            {"kind": kind, "model": self.model, "temp": self.temperature, **request}
+        )
 
-    @rate_limit(_rate_limiter)
-    def analyze_video_with_transcript(
+    def _video_cache_key(
         self,
         video_url: str,
         prompt: str,
-        response_schema: dict | None = None,
-        fps: float = 0.5,
-        start_time: int | None = None,
-        end_time: int | None = None,
-        quality: str | None = None,
-        stage: str = "video_transcription",
-    ) -> dict[str, Any]:
-        """
-        Analyze a YouTube video and generate transcript.
+        response_schema: dict | None,
+        fps: float,
+        start_time: int | None,
+        end_time: int | None,
+        quality: str | None,
+    ) -> str | None:
+        return self._cache_key(
+            "video_transcript",
+            video_url=video_url,
+            prompt=prompt,
+            schema=response_schema,
+            fps=fps,
+            start=start_time,
+            end=end_time,
+            quality=quality,
+        )
 
-        Args:
-            video_url: YouTube video URL
-            prompt: Instruction prompt for transcription
-            response_schema: Optional JSON schema for structured output
-            fps: Frames per second to sample (lower = fewer tokens)
-            start_time: Optional start time in seconds
-            end_time: Optional end time in seconds
-            quality: Video quality level (low, medium, high)
+    def _generation_config(self, response_schema: dict | None) -> types.GenerateContentConfig:
+        """
+        Return the generation config shared by all generate_content calls.
 
-        Returns:
-            Parsed JSON response from model
+        Schemas are module-level dicts reused for every call of a stage, so
+        configs are memoized by schema identity (plus the generation settings,
+        which may be changed on the instance). The schema is held in the cache
+        entry so its id cannot be recycled while the entry is alive.
         """
-        # Prepare generation config
+        key = (id(response_schema), self.temperature, self.max_output_tokens, self.thinking_budget)
+        entry = self._config_cache.get(key)
+        if entry is not None:
+            self._config_cache.move_to_end(key)
+            return entry[1]
+
+        config = self._build_generation_config(response_schema)
+        self._config_cache[key] = (response_schema, config)
+        if len(self._config_cache) > self.CONFIG_CACHE_SIZE:
+            self._config_cache.popitem(last=False)
+        return config
+
+    def _build_generation_config(self, response_schema: dict | None) -> types.GenerateContentConfig:
+        # Every caller expects a JSON object back, so always request JSON mode;
+        # a schema additionally constrains decoding to that structure
         config_kwargs: dict[str, Any] = {
             "temperature": self.temperature,
             "max_output_tokens": self.max_output_tokens,
+            "response_mime_type": "application/json",
         }
         if response_schema:
-            config_kwargs["response_mime_type"] = "application/json"
             config_kwargs["response_schema"] = response_schema
 
         # Add thinking config if thinking_budget is specified
@@ -282,8 +442,18 @@ class GeminiClient:
                 include_thoughts=False,  # Don't include thinking in output
             )
 
-        generation_config = types.GenerateContentConfig(**config_kwargs)
+        return types.GenerateContentConfig(**config_kwargs)
 
+    def _video_content(
+        self,
+        video_url: str,
+        prompt: str,
+        fps: float,
+        start_time: int | None,
+        end_time: int | None,
+        quality: str | None,
+    ) -> types.Content:
+        """Build the request content for a YouTube video analysis."""
         # Map quality to PartMediaResolutionLevel
         quality_map = {
             "low": types.PartMediaResolutionLevel.MEDIA_RESOLUTION_LOW,
@@ -313,42 +483,359 @@ class GeminiClient:
             video_part_kwargs["media_resolution"] = media_resolution
 
         # Build content with proper structure for YouTube URL
-        content = types.Content(
+        return types.Content(
             parts=[
                 types.Part(**video_part_kwargs),
                 types.Part(text=prompt),
             ]
         )
 
-        # Retry logic for transient failures
+    def _transcript_contents(self, transcript_data: dict, prompt: str) -> list[types.Part]:
+        """Build the request contents for entity extraction over a transcript."""
+        # Compact JSON: indentation only adds whitespace tokens the model has to read
+        transcript_json = orjson.dumps(transcript_data).decode()
+
+        # Separate parts avoid copying the (potentially multi-MB) JSON into a
+        # combined prompt string; the model sees them as consecutive text
+        return [
+            types.Part(text=prompt),
+            types.Part(text="Transcript data:\n"),
+            types.Part(text=transcript_json),
+        ]
+
+    def _retry_delay(self, error: Exception, attempt: int, retry_json: bool = True) -> float | None:
+        """
+        Return how long to wait before retrying after error, or None if it is fatal.
+
+        Malformed JSON is retried immediately since waiting does not make the
+        model more likely to produce valid output, and not at all when
+        retry_json is False. Rate limits and server errors back off
+        exponentially with jitter so concurrent workers do not retry in lockstep,
+        waiting at least as long as the server asked for when it said so (up to
+        MAX_RETRY_DELAY).
+        """
+        if isinstance(error, json.JSONDecodeError):
+            return 0.0 if retry_json else None
+        if isinstance(error, genai_errors.APIError) and error.code in self.RETRYABLE_STATUS_CODES:
+            backoff: float = min(self.MAX_RETRY_DELAY, self.RETRY_DELAY_BASE * 2 ** (attempt - 1))
+            server_delay = self._server_retry_delay(error)
+            if server_delay is not None:
+                backoff = max(backoff, min(server_delay, self.MAX_RETRY_DELAY))
+            return backoff + random.uniform(0, 1)
+        return None
+
+    @staticmethod
+    def _server_retry_delay(error: genai_errors.APIError) -> float | None:
+        """
+        Return the delay requested by the server, in seconds, if any.
+
+        Gemini reports it as a google.rpc.RetryInfo detail (e.g. "retryDelay": "37s");
+        a Retry-After header is honoured as well. Negative or NaN values are ignored.
+        """
+        body = error.details.get("error", error.details) if isinstance(error.details, dict) else {}
+        for detail in body.get("details") or []:
+            if isinstance(detail, dict) and detail.get("@type", "").endswith("RetryInfo"):
+                delay = _parse_retry_delay(str(detail.get("retryDelay", "")).removesuffix("s"))
+                if delay is not None:
+                    return delay
+                break
+
+        headers = getattr(error.response, "headers", None)
+        retry_after = headers.get("retry-after") if headers is not None else None
+        # The HTTP-date form does not parse; fall back to exponential backoff
+        return _parse_retry_delay(str(retry_after)) if retry_after is not None else None
+
+    def _call_with_retry(self, call: Callable[[], R], context: str, retry_json: bool = True) -> R:
+        """Run call, retrying malformed JSON (if retry_json) and transient API errors."""
         for attempt in range(1, self.MAX_RETRIES + 1):
             try:
-                # Generate content
-                start_time_perf = time.perf_counter()
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=content,
-                    config=generation_config,
-                )
-                duration_ms = (time.perf_counter() - start_time_perf) * 1000
-                self._record_usage(response, stage=stage, duration_ms=duration_ms)
+                return call()
+            except (json.JSONDecodeError, genai_errors.APIError) as e:
+                delay = self._retry_delay(e, attempt, retry_json)
+                if delay is None or attempt == self.MAX_RETRIES:
+                    # Final failure - re-raise
+                    raise
+                if delay > 0:
+                    time.sleep(delay)
 
-                # Parse response with enhanced error messages
-                return self._safe_json_parse(
-                    response.text or "", context="video transcript analysis"
-                )
+        raise RuntimeError(f"Gemini request failed ({context})")
 
-            except json.JSONDecodeError:
-                if attempt < self.MAX_RETRIES:
-                    delay = self.RETRY_DELAY_BASE * attempt
-                    time.sleep(delay)
-                else:
-                    # Final failure - re-raise
+    async def _acall_with_retry(
+        self, call: Callable[[], Awaitable[R]], context: str, retry_json: bool = True
+    ) -> R:
+        """Async variant of _call_with_retry."""
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                return await call()
+            except (json.JSONDecodeError, genai_errors.APIError) as e:
+                delay = self._retry_delay(e, attempt, retry_json)
+                if delay is None or attempt == self.MAX_RETRIES:
                     raise
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        raise RuntimeError(f"Gemini request failed ({context})")
+
+    def _generate(
+        self,
+        contents: Any,
+        response_schema: dict | None,
+        stage: str,
+        context: str,
+        cache_key: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run generate_content with retries and return the parsed JSON payload.
+
+        The cache is consulted first when cache_key is given.
+        """
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cast(dict[str, Any], cached)
+
+        generation_config = self._generation_config(response_schema)
+
+        def call() -> dict[str, Any]:
+            # Note: timeout is enforced by the client's HTTP configuration
+            start_time_perf = time.perf_counter()
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=generation_config,
+            )
+            duration_ms = (time.perf_counter() - start_time_perf) * 1000
+            self._record_usage(response, stage=stage, duration_ms=duration_ms)
+            return self._parse_response(response, response_schema, context=context)
+
+        # Throttle only requests that actually reach the API, not cache hits
+        _rate_limiter.wait_if_needed()
+        # Schema-constrained output only fails to parse when truncated, which a
+        # deterministic retry would reproduce, so only unconstrained calls retry
+        parsed = self._call_with_retry(call, context, retry_json=response_schema is None)
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, parsed)
+        return parsed
+
+    async def _agenerate(
+        self,
+        contents: Any,
+        response_schema: dict | None,
+        stage: str,
+        context: str,
+        cache_key: str | None = None,
+    ) -> dict[str, Any]:
+        """Async variant of _generate using the client's native aio interface."""
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cast(dict[str, Any], cached)
+
+        generation_config = self._generation_config(response_schema)
+
+        async def call() -> dict[str, Any]:
+            start_time_perf = time.perf_counter()
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=generation_config,
+            )
+            duration_ms = (time.perf_counter() - start_time_perf) * 1000
+            self._record_usage(response, stage=stage, duration_ms=duration_ms)
+            return self._parse_response(response, response_schema, context=context)
+
+        await _rate_limiter.async_wait_if_needed()
+        parsed = await self._acall_with_retry(call, context, retry_json=response_schema is None)
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, parsed)
+        return parsed
+
+    def analyze_pdf_with_vision(
+        self,
+        pdf_path: Path,
+        prompt: str,
+        response_schema: dict | None = None,
+        stage: str = "pdf_vision",
+    ) -> dict[str, Any]:
+        """
+        Analyze a PDF using Gemini vision with optional structured output.
+
+        Args:
+            pdf_path: Path to PDF file
+            prompt: Instruction prompt for analysis
+            response_schema: Optional JSON schema for structured output
+
+        Returns:
+            Parsed JSON response from model
+        """
+        file_hash = _sha256_file(pdf_path)
+        cache_key = self._cache_key(
+            "pdf_vision", prompt=prompt, schema=response_schema, file=file_hash
+        )
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cast(dict[str, Any], cached)
+
+        # Upload the PDF file (reusing an earlier upload of the same content)
+        uploaded_file = self._upload_file(pdf_path, file_hash)
 
-        raise RuntimeError("Failed to analyze video with Gemini")
+        try:
+            parsed = self._generate(
+                [prompt, uploaded_file], response_schema, stage, context="PDF vision analysis"
+            )
+        except genai_errors.ClientError as e:
+            if not self._is_stale_file_error(e):
+                raise
+            # The remote file expired or was deleted; upload it again
+            self._file_cache.pop(file_hash, None)
+            uploaded_file = self._upload_file(pdf_path, file_hash)
+            parsed = self._generate(
+                [prompt, uploaded_file], response_schema, stage, context="PDF vision analysis"
+            )
+
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, parsed)
+        return parsed
+
+    async def aanalyze_pdf_with_vision(
+        self,
+        pdf_path: Path,
+        prompt: str,
+        response_schema: dict | None = None,
+        stage: str = "pdf_vision",
+    ) -> dict[str, Any]:
+        """Async variant of analyze_pdf_with_vision."""
+        file_hash = await asyncio.to_thread(_sha256_file, pdf_path)
+        cache_key = self._cache_key(
+            "pdf_vision", prompt=prompt, schema=response_schema, file=file_hash
+        )
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cast(dict[str, Any], cached)
+
+        uploaded_file = await self._aupload_file(pdf_path, file_hash)
+
+        try:
+            parsed = await self._agenerate(
+                [prompt, uploaded_file], response_schema, stage, context="PDF vision analysis"
+            )
+        except genai_errors.ClientError as e:
+            if not self._is_stale_file_error(e):
+                raise
+            self._file_cache.pop(file_hash, None)
+            uploaded_file = await self._aupload_file(pdf_path, file_hash)
+            parsed = await self._agenerate(
+                [prompt, uploaded_file], response_schema, stage, context="PDF vision analysis"
+            )
+
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(cache_key, parsed)
+        return parsed
+
+    @classmethod
+    def _is_stale_file_error(cls, error: genai_errors.ClientError) -> bool:
+        """Return whether error says an uploaded file expired or was deleted."""
+        if error.code == cls.STALE_FILE_STATUS_CODE:
+            return True
+        # Other 403s (API key, project permissions) are unrelated to the file,
+        # so re-uploading would only waste an upload before failing again
+        return (
+            error.code == cls.STALE_FILE_FORBIDDEN_CODE and "file" in (error.message or "").lower()
+        )
+
+    def _cached_upload(self, file_hash: str) -> Any | None:
+        """Return a still-valid uploaded file handle for the given content hash."""
+        entry = self._file_cache.get(file_hash)
+        if entry is None:
+            return None
+        uploaded_file, uploaded_at = entry
+        if time.monotonic() - uploaded_at >= self.UPLOAD_TTL_SECONDS:
+            del self._file_cache[file_hash]
+            return None
+        return uploaded_file
+
+    def _upload_file(self, path: Path, file_hash: str) -> Any:
+        uploaded_file = self._cached_upload(file_hash)
+        if uploaded_file is None:
+            _rate_limiter.wait_if_needed()
+            uploaded_file = self.client.files.upload(file=str(path))
+            self._file_cache[file_hash] = (uploaded_file, time.monotonic())
+        return uploaded_file
+
+    async def _aupload_file(self, path: Path, file_hash: str) -> Any:
+        uploaded_file = self._cached_upload(file_hash)
+        if uploaded_file is None:
+            await _rate_limiter.async_wait_if_needed()
+            uploaded_file = await self.client.aio.files.upload(file=str(path))
+            self._file_cache[file_hash] = (uploaded_file, time.monotonic())
+        return uploaded_file
+
+    def analyze_video_with_transcript(
+        self,
+        video_url: str,
+        prompt: str,
+        response_schema: dict | None = None,
+        fps: float = 0.5,
+        start_time: int | None = None,
+        end_time: int | None = None,
+        quality: str | None = None,
+        stage: str = "video_transcription",
+    ) -> dict[str, Any]:
+        """
+        Analyze a YouTube video and generate transcript.
+
+        Args:
+            video_url: YouTube video URL
+            prompt: Instruction prompt for transcription
+            response_schema: Optional JSON schema for structured output
+            fps: Frames per second to sample (lower = fewer tokens)
+            start_time: Optional start time in seconds
+            end_time: Optional end time in seconds
+            quality: Video quality level (low, medium, high)
+
+        Returns:
+            Parsed JSON response from model
+        """
+        content = self._video_content(video_url, prompt, fps, start_time, end_time, quality)
+        cache_key = self._video_cache_key(
+            video_url, prompt, response_schema, fps, start_time, end_time, quality
+        )
+
+        return self._generate(
+            content,
+            response_schema,
+            stage,
+            context="video transcript analysis",
+            cache_key=cache_key,
+        )
+
+    async def aanalyze_video_with_transcript(
+        self,
+        video_url: str,
+        prompt: str,
+        response_schema: dict | None = None,
+        fps: float = 0.5,
+        start_time: int | None = None,
+        end_time: int | None = None,
+        quality: str | None = None,
+        stage: str = "video_transcription",
+    ) -> dict[str, Any]:
+        """Async variant of analyze_video_with_transcript."""
+        content = self._video_content(video_url, prompt, fps, start_time, end_time, quality)
+        cache_key = self._video_cache_key(
+            video_url, prompt, response_schema, fps, start_time, end_time, quality
+        )
+
+        return await self._agenerate(
+            content,
+            response_schema,
+            stage,
+            context="video transcript analysis",
+            cache_key=cache_key,
+        )
 
-    @rate_limit(_rate_limiter)
     def extract_entities_and_concepts(
         self,
         transcript_data: dict,
@@ -367,61 +854,97 @@ class GeminiClient:
         Returns:
             Parsed JSON response with entities and concepts
         """
-        # Convert transcript data to JSON string for context
-        transcript_json = json.dumps(transcript_data, indent=2)
+        contents = self._transcript_contents(transcript_data, prompt)
+        cache_key = self._cache_key(
+            "kg_extraction", prompt=prompt, schema=response_schema, transcript=transcript_data
+        )
 
-        # Prepare generation config
-        config_kwargs: dict[str, Any] = {
-            "temperature": self.temperature,
-            "max_output_tokens": self.max_output_tokens,
-        }
-        if response_schema:
-            config_kwargs["response_mime_type"] = "application/json"
-            config_kwargs["response_schema"] = response_schema
+        return self._generate(
+            contents, response_schema, stage, context="entity extraction", cache_key=cache_key
+        )
 
-        # Add thinking config if thinking_budget is specified
-        if self.thinking_budget is not None:
-            config_kwargs["thinking_config"] = types.ThinkingConfig(
-                thinking_budget=self.thinking_budget,
-                include_thoughts=False,  # Don't include thinking in output
-            )
+    async def aextract_entities_and_concepts(
+        self,
+        transcript_data: dict,
+        prompt: str,
+        response_schema: dict | None = None,
+        stage: str = "kg_extraction",
+    ) -> dict[str, Any]:
+        """Async variant of extract_entities_and_concepts."""
+        contents = self._transcript_contents(transcript_data, prompt)
+        cache_key = self._cache_key(
+            "kg_extraction", prompt=prompt, schema=response_schema, transcript=transcript_data
+        )
 
-        generation_config = types.GenerateContentConfig(**config_kwargs)
+        return await self._agenerate(
+            contents, response_schema, stage, context="entity extraction", cache_key=cache_key
+        )
 
-        # Combine prompt with transcript context
-        full_prompt = f"{prompt}\n\nTranscript data:\n{transcript_json}"
+    async def aextract_entities_streaming(
+        self,
+        transcript_data: dict,
+        prompt: str,
+        response_schema: dict | None = None,
+        key: str = "entities",
+        stage: str = "kg_extraction",
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream elements of one array field of an entity extraction as they are generated.
 
-        # Retry logic for transient failures
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                # Generate content
-                start_time_perf = time.perf_counter()
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=full_prompt,
-                    config=generation_config,
-                )
-                duration_ms = (time.perf_counter() - start_time_perf) * 1000
-                self._record_usage(response, stage=stage, duration_ms=duration_ms)
+        Uses generate_content_stream so callers can start processing the first
+        entities while the model is still producing the rest. Streamed requests
+        are not retried, since elements may already have been handed out.
+
+        Args:
+            transcript_data: Structured transcript data
+            prompt: Instruction prompt for entity extraction
+            response_schema: Optional JSON schema for structured output
+            key: Top-level array field to stream (e.g. "entities")
+            stage: Stage name for usage tracking
 
-                parsed = getattr(response, "parsed", None)
-                if isinstance(parsed, dict):
-                    return parsed
+        Yields:
+            Each completed element of the array, in order
+        """
+        cache_key = self._cache_key(
+            "kg_extraction", prompt=prompt, schema=response_schema, transcript=transcript_data
+        )
+        if cache_key is not None and self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                for element in cached.get(key, []):
+                    yield element
+                return
 
-                # Parse response with enhanced error messages
-                return self._safe_json_parse(response.text or "", context="entity extraction")
+        # Throttle only once the request is known to reach the API
+        await _rate_limiter.async_wait_if_needed()
 
-            except json.JSONDecodeError:
-                if attempt < self.MAX_RETRIES:
-                    delay = self.RETRY_DELAY_BASE * attempt
-                    time.sleep(delay)
-                else:
-                    # Final failure - re-raise
-                    raise
+        contents = self._transcript_contents(transcript_data, prompt)
+        scanner = _ArrayElementScanner(key)
+        chunks: list[str] = []
+        last_chunk = None
+
+        start_time_perf = time.perf_counter()
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=self._generation_config(response_schema),
+        )
+        async for last_chunk in stream:
+            text = last_chunk.text or ""
+            if cache_key is not None:
+                chunks.append(text)
+            for element in scanner.feed(text):
+                yield element
+        duration_ms = (time.perf_counter() - start_time_perf) * 1000
 
-        raise RuntimeError("Failed to extract entities with Gemini")
+        # Usage metadata is reported cumulatively, so the final chunk has the totals
+        if last_chunk is not None:
+            self._record_usage(last_chunk, stage=stage, duration_ms=duration_ms)
+        if cache_key is not None and self.cache is not None:
+            self.cache.set(
+                cache_key, self._safe_json_parse("".join(chunks), context="entity extraction")
+            )
 
-    @rate_limit(_rate_limiter)
     def generate_structured(
         self,
         prompt: str,
@@ -439,85 +962,190 @@ class GeminiClient:
         Returns:
             Parsed JSON response matching the schema
         """
-        # Prepare generation config
-        config_kwargs: dict[str, Any] = {
-            "temperature": self.temperature,
-            "max_output_tokens": self.max_output_tokens,
-            "response_mime_type": "application/json",
-            "response_schema": response_schema,
-        }
+        cache_key = self._cache_key("structured", prompt=prompt, schema=response_schema)
 
-        # Add thinking config if thinking_budget is specified
-        if self.thinking_budget is not None:
-            config_kwargs["thinking_config"] = types.ThinkingConfig(
-                thinking_budget=self.thinking_budget,
-                include_thoughts=False,
-            )
-
-        generation_config = types.GenerateContentConfig(**config_kwargs)
-
-        # Retry logic for transient failures
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                # Generate content
-                start_time_perf = time.perf_counter()
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt,
-                    config=generation_config,
-                )
-                duration_ms = (time.perf_counter() - start_time_perf) * 1000
-                self._record_usage(response, stage=stage, duration_ms=duration_ms)
-
-                # Parse response
-                return self._safe_json_parse(response.text or "", context="structured generation")
+        return self._generate(
+            prompt, response_schema, stage, context="structured generation", cache_key=cache_key
+        )
 
-            except json.JSONDecodeError:
-                if attempt < self.MAX_RETRIES:
-                    delay = self.RETRY_DELAY_BASE * attempt
-                    time.sleep(delay)
-                else:
-                    raise
+    async def agenerate_structured(
+        self,
+        prompt: str,
+        response_schema: dict,
+        stage: str = "structured_generation",
+    ) -> dict[str, Any]:
+        """Async variant of generate_structured."""
+        cache_key = self._cache_key("structured", prompt=prompt, schema=response_schema)
 
-        raise RuntimeError("Failed to generate structured output with Gemini")
+        return await self._agenerate(
+            prompt, response_schema, stage, context="structured generation", cache_key=cache_key
+        )
 
-    @rate_limit(_rate_limiter)
     def embed_texts(
         self,
         texts: list[str],
         model: str | None = None,
         stage: str = "embeddings",
-    ) -> list[list[float]]:
+        normalize: bool = False,
+        dtype: np.dtype | type = np.float32,
+    ) -> np.ndarray:
         """
         Generate embeddings for text chunks.
 
+        Texts are sent in batches of EMBED_BATCH_SIZE, each counted
+        separately against the rate limiter.
+
         Args:
             texts: List of text strings to embed
             model: Embedding model name (if None, uses v1beta default)
+            normalize: Scale each vector to unit length so dot products are cosines
+            dtype: Output dtype (e.g. np.float16 for compact in-memory search)
 
         Returns:
-            List of embedding vectors
+            Array of shape (len(texts), dimensions)
         """
         if model is None:
             model = "text-embedding-004"  # Default model for v1beta
 
-        start_time_perf = time.perf_counter()
-        response = self.client.models.embed_content(
-            model=model,
-            contents=texts,
-        )
-        duration_ms = (time.perf_counter() - start_time_perf) * 1000
-        self._record_usage(response, stage=stage, duration_ms=duration_ms)
+        keys, cached, missing = self._embedding_cache_lookup(texts, model)
+        if not missing:
+            embeddings = self._merge_cached_embeddings(keys, cached, missing, None)
+        else:
+            batches = self._embedding_batches([texts[i] for i in missing])
+            fresh = [self._embed_batch(batch, model, stage) for batch in batches]
+            embeddings = self._merge_cached_embeddings(keys, cached, missing, np.concatenate(fresh))
+
+        return self._finalize_embeddings(embeddings, normalize, dtype)
+
+    async def aembed_texts(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        stage: str = "embeddings",
+        normalize: bool = False,
+        dtype: np.dtype | type = np.float32,
+    ) -> np.ndarray:
+        """Async variant of embed_texts, running up to EMBED_MAX_CONCURRENCY batches at once."""
+        if model is None:
+            model = "text-embedding-004"  # Default model for v1beta
+
+        keys, cached, missing = self._embedding_cache_lookup(texts, model)
+        if not missing:
+            embeddings = self._merge_cached_embeddings(keys, cached, missing, None)
+            return self._finalize_embeddings(embeddings, normalize, dtype)
+
+        semaphore = asyncio.Semaphore(self.EMBED_MAX_CONCURRENCY)
+
+        async def embed_batch(batch: list[str]) -> np.ndarray:
+            async with semaphore:
+                return await self._aembed_batch(batch, model, stage)
+
+        batches = self._embedding_batches([texts[i] for i in missing])
+        fresh = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+
+        embeddings = self._merge_cached_embeddings(keys, cached, missing, np.concatenate(fresh))
+        return self._finalize_embeddings(embeddings, normalize, dtype)
+
+    @staticmethod
+    def _finalize_embeddings(
+        embeddings: np.ndarray, normalize: bool, dtype: np.dtype | type
+    ) -> np.ndarray:
+        """Optionally unit-normalize (in float32) and cast to the requested dtype."""
+        if normalize and embeddings.size:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings.astype(dtype, copy=False)
+
+    def _embedding_batches(self, texts: list[str]) -> list[list[str]]:
+        size = self.EMBED_BATCH_SIZE
+        return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+    def _embed_batch(self, batch: list[str], model: str, stage: str) -> np.ndarray:
+        _rate_limiter.wait_if_needed()
+
+        def call() -> np.ndarray:
+            start_time_perf = time.perf_counter()
+            response = self.client.models.embed_content(model=model, contents=batch)
+            duration_ms = (time.perf_counter() - start_time_perf) * 1000
+            self._record_usage(response, stage=stage, duration_ms=duration_ms)
+            return self._embeddings_to_array(response)
 
-        embeddings: list[list[float]] = []
+        return self._call_with_retry(call, "embeddings")
+
+    async def _aembed_batch(self, batch: list[str], model: str, stage: str) -> np.ndarray:
+        await _rate_limiter.async_wait_if_needed()
+
+        async def call() -> np.ndarray:
+            start_time_perf = time.perf_counter()
+            response = await self.client.aio.models.embed_content(model=model, contents=batch)
+            duration_ms = (time.perf_counter() - start_time_perf) * 1000
+            self._record_usage(response, stage=stage, duration_ms=duration_ms)
+            return self._embeddings_to_array(response)
+
+        return await self._acall_with_retry(call, "embeddings")
+
+    def embed_texts_list(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        stage: str = "embeddings",
+    ) -> list[list[float]]:
+        """Generate embeddings as nested Python lists (legacy format of embed_texts)."""
+        return cast(list[list[float]], self.embed_texts(texts, model=model, stage=stage).tolist())
+
+    def _embedding_cache_lookup(
+        self, texts: list[str], model: str
+    ) -> tuple[list[str] | None, list[Any], list[int]]:
+        """
+        Look up per-text embeddings in the cache.
+
+        Embeddings are deterministic, so they are cached regardless of the
+        generation temperature.
+
+        Returns:
+            Tuple of (cache keys or None if uncached, cached vectors, indices still to embed)
+        """
+        if self.cache is None:
+            return None, [], list(range(len(texts)))
+
+        keys = [LLMCache.make_key({"kind": "embedding", "model": model, "text": t}) for t in texts]
+        cached = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        return keys, cached, missing
+
+    def _merge_cached_embeddings(
+        self,
+        keys: list[str] | None,
+        cached: list[Any],
+        missing: list[int],
+        fresh: np.ndarray | None,
+    ) -> np.ndarray:
+        """Store freshly computed vectors and combine them with cached ones in input order."""
+        cache = self.cache
+        if keys is None or cache is None:
+            # Nothing cached means every row is fresh (and none at all for empty input)
+            return fresh if fresh is not None else np.empty((0, 0), dtype=np.float32)
+
+        if fresh is not None:
+            for row, i in enumerate(missing):
+                cached[i] = fresh[row]
+                cache.set(keys[i], fresh[row].tolist())
+
+        if not cached:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.asarray(cached, dtype=np.float32)
+
+    def _embeddings_to_array(self, response: Any) -> np.ndarray:
+        """Copy the vectors of an embed_content response into one float32 array."""
         raw_embeddings = getattr(response, "embeddings", None)
         if raw_embeddings is None:
             single_embedding = getattr(response, "embedding", None)
             if single_embedding is None:
                 raise ValueError("Unexpected embeddings response format")
-            return [list(cast(Iterable[float], single_embedding))]
+            return np.asarray(single_embedding, dtype=np.float32).reshape(1, -1)
 
-        for item in raw_embeddings:
+        out: np.ndarray | None = None
+        for row, item in enumerate(raw_embeddings):
             values = getattr(item, "values", None)
             if values is None:
                 values = getattr(item, "embedding", None)
@@ -525,6 +1153,11 @@ class GeminiClient:
                 values = item
             if values is None:
                 raise ValueError("Unexpected embedding item format")
-            embeddings.append(list(cast(Iterable[float], values)))
-
-        return embeddings
+            if out is None:
+                # Dimension is only known once the first vector has been seen
+                out = np.empty((len(raw_embeddings), len(values)), dtype=np.float32)
+            out[row] = np.asarray(values, dtype=np.float32)
+
+        if out is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return out
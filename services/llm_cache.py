@@ -0,0 +1,102 @@
+"""Persistent response cache for deterministic LLM calls."""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+DEFAULT_CACHE_DIR = Path("data/gemini_cache")
+
+
+class LLMCache:
+    """
+    Two-tier cache for parsed LLM responses.
+
+    An in-process LRU sits in front of a directory of JSON files, one per
+    request key. Keys are SHA-256 digests of the canonicalized request, so
+    identical requests (same model, prompt, schema, inputs) map to the same
+    entry across runs. Entries are held as serialized bytes and decoded on
+    every get, so callers always receive a fresh object they may mutate.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_CACHE_DIR,
+        max_memory_entries: int = 1024,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            directory: Directory for persisted entries (created on first write)
+            max_memory_entries: Maximum entries held in the in-process LRU
+        """
+        self.directory = Path(directory)
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(payload: dict[str, Any]) -> str:
+        """Hash a request description into a stable cache key."""
+        # Stdlib json keeps keys identical to those of existing cache entries
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        # Shard by prefix to keep directory listings small
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None on a miss."""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.stats["hits"] += 1
+            return orjson.loads(data)
+
+        try:
+            data = self._path(key).read_bytes()
+            value = orjson.loads(data)
+        except (OSError, orjson.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+
+        self._remember(key, data)
+        self.stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        data = orjson.dumps(value)
+        self._remember(key, data)
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def clear(self) -> None:
+        """Remove all cached entries, in memory and on disk."""
+        self._memory.clear()
+        if self.directory.exists():
+            for path in self.directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
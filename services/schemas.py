@@ -200,122 +200,138 @@ RELATIONSHIP_SCHEMA = {
     "required": ["relationships"],
 }
 
-# Chunk entity extraction schema (for processing small chunks)
-CHUNK_ENTITY_SCHEMA = {
-    "type": "object",
-    "properties": {
-        "entities": {
-            "type": "array",
-            "description": "Entities found in this chunk",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "entity_id": {"type": "string"},
-                    "entity_type": {
-                        "type": "string",
-                        "enum": [
-                            "person",
-                            "organization",
-                            "place",
-                            "law",
-                            "concept",
-                            "event",
-                            "numeric_fact",
-                            "policy_position",
-                        ],
-                    },
-                    "name": {"type": "string"},
-                    "canonical_name": {"type": "string"},
-                    "aliases": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                    },
-                    "description": {"type": "string"},
-                    "mentions": {
-                        "type": "array",
-                        "description": "Where this entity is mentioned in this chunk",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "sentence_index": {
-                                    "type": "integer",
-                                    "description": "Index of sentence in the chunk",
-                                },
-                                "context": {
-                                    "type": "string",
-                                    "description": "First 150 chars of the sentence",
-                                },
-                            },
-                            "required": ["sentence_index"],
+# Entities array shared by the chunk entity and combined extraction schemas
+CHUNK_ENTITIES_PROPERTY = {
+    "type": "array",
+    "description": "Entities found in this chunk",
+    "items": {
+        "type": "object",
+        "properties": {
+            "entity_id": {"type": "string"},
+            "entity_type": {
+                "type": "string",
+                "enum": [
+                    "person",
+                    "organization",
+                    "place",
+                    "law",
+                    "concept",
+                    "event",
+                    "numeric_fact",
+                    "policy_position",
+                ],
+            },
+            "name": {"type": "string"},
+            "canonical_name": {"type": "string"},
+            "aliases": {
+                "type": "array",
+                "items": {"type": "string"},
+            },
+            "description": {"type": "string"},
+            "mentions": {
+                "type": "array",
+                "description": "Where this entity is mentioned in this chunk",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "sentence_index": {
+                            "type": "integer",
+                            "description": "Index of sentence in the chunk",
+                        },
+                        "context": {
+                            "type": "string",
+                            "description": "First 150 chars of the sentence",
                         },
                     },
-                    "confidence": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                    },
+                    "required": ["sentence_index"],
                 },
-                "required": ["entity_id", "entity_type", "name", "canonical_name"],
+            },
+            "confidence": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
             },
         },
+        "required": ["entity_id", "entity_type", "name", "canonical_name"],
     },
-    "required": ["entities"],
 }
 
-# Chunk relationship extraction schema
-CHUNK_RELATIONSHIP_SCHEMA = {
+# Chunk entity extraction schema (for processing small chunks)
+CHUNK_ENTITY_SCHEMA = {
     "type": "object",
     "properties": {
-        "relationships": {
-            "type": "array",
-            "description": "Relationships found in this chunk",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "source_id": {"type": "string"},
-                    "target_id": {"type": "string"},
-                    "relation_type": {
-                        "type": "string",
-                        "enum": [
-                            "mentions",
-                            "supports",
-                            "opposes",
-                            "relates_to",
-                            "references",
-                            "questions",
-                            "answers",
-                            "states",
-                        ],
-                    },
-                    "sentiment": {
-                        "type": "string",
-                        "enum": ["positive", "negative", "neutral"],
-                    },
-                    "evidence": {"type": "string"},
-                    "evidence_sentence_index": {
-                        "type": "integer",
-                        "description": "Index of the sentence containing the evidence",
-                    },
-                    "confidence": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                    },
-                },
-                "required": [
-                    "source_id",
-                    "target_id",
-                    "relation_type",
-                    "sentiment",
-                    "evidence",
-                    "evidence_sentence_index",
+        "entities": CHUNK_ENTITIES_PROPERTY,
+    },
+    "required": ["entities"],
+}
+
+# Relationships array shared by the chunk relationship and combined extraction schemas
+CHUNK_RELATIONSHIPS_PROPERTY = {
+    "type": "array",
+    "description": "Relationships found in this chunk",
+    "items": {
+        "type": "object",
+        "properties": {
+            "source_id": {"type": "string"},
+            "target_id": {"type": "string"},
+            "relation_type": {
+                "type": "string",
+                "enum": [
+                    "mentions",
+                    "supports",
+                    "opposes",
+                    "relates_to",
+                    "references",
+                    "questions",
+                    "answers",
+                    "states",
                 ],
             },
+            "sentiment": {
+                "type": "string",
+                "enum": ["positive", "negative", "neutral"],
+            },
+            "evidence": {"type": "string"},
+            "evidence_sentence_index": {
+                "type": "integer",
+                "description": "Index of the sentence containing the evidence",
+            },
+            "confidence": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1,
+            },
         },
+        "required": [
+            "source_id",
+            "target_id",
+            "relation_type",
+            "sentiment",
+            "evidence",
+            "evidence_sentence_index",
+        ],
+    },
+}
+
+# Chunk relationship extraction schema
+CHUNK_RELATIONSHIP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "relationships": CHUNK_RELATIONSHIPS_PROPERTY,
     },
     "required": ["relationships"],
 }
 
+# Combined chunk extraction schema (entities and relationships in one request)
+CHUNK_EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "entities": CHUNK_ENTITIES_PROPERTY,
+        "relationships": CHUNK_RELATIONSHIPS_PROPERTY,
+    },
+    "required": ["entities", "relationships"],
+}
+
 # Entity deduplication resolution schema
 DEDUPLICATION_SCHEMA = {
     "type": "object",
@@ -3,11 +3,12 @@
 import re
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+from rapidfuzz import fuzz
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from thefuzz import fuzz
 
 from core.config import get_settings
 from models.speaker import Speaker
@@ -15,6 +16,56 @@ from parsers.models import OrderPaperSpeaker
 
 settings = get_settings()
 
+# Titles stripped from the start of names, checked in this order
+_TITLES = (
+    "hon.",
+    "honourable",
+    "the honourable",
+    "the hon.",
+    "dr.",
+    "dr",
+    "mr.",
+    "mr",
+    "mrs.",
+    "mrs",
+    "ms.",
+    "ms",
+    "miss",
+    "sir",
+    "dame",
+    "prof.",
+    "professor",
+    "senator",
+    "sen.",
+    "mp",
+    "k.c.",
+    "kc",
+    "rev.",
+    "rev",
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_speaker_name(name: str) -> str:
+    """Normalize a speaker name; memoized since the same names recur across sessions."""
+    normalized = name.lower().strip()
+
+    # Remove titles
+    for title in _TITLES:
+        if normalized.startswith(title + " "):
+            normalized = normalized[len(title) :].strip()
+        if normalized.startswith(title):
+            normalized = normalized[len(title) :].strip()
+
+    # Remove extra whitespace and punctuation
+    normalized = _PUNCTUATION_RE.sub("", normalized)
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+
+    return normalized
+
 
 class SpeakerService:
     """Service for managing canonical speakers with deduplication."""
@@ -30,6 +81,8 @@ class SpeakerService:
         self.session = session
         self.threshold = threshold if threshold is not None else settings.fuzzy_match_threshold
         self._all_speakers: list[Speaker] | None = None
+        self._normalized_names: list[str] = []  # Parallel to _all_speakers
+        self._speakers_by_name: dict[str, Speaker] = {}
 
     async def get_or_create_speaker(
         self,
@@ -115,24 +168,28 @@ class SpeakerService:
         """
         all_speakers = await self._get_all_speakers()
         normalized_name = self._normalize_name(name)
+        role_lower = role.lower() if role else None
 
-        # Stage 1: Exact normalized match
-        for speaker in all_speakers:
-            if self._normalize_name(speaker.name) == normalized_name:
-                return speaker
+        # Stage 1: Exact normalized match (names made only of titles normalize to "")
+        exact = self._speakers_by_name.get(normalized_name) if normalized_name else None
+        if exact:
+            return exact
 
         # Stage 2: Fuzzy matching with role disambiguation
         best_match: Speaker | None = None
-        best_score = 0
-        second_best_score = 0
+        best_score: float = 0
+        second_best_score: float = 0
+
+        for speaker, speaker_normalized in zip(all_speakers, self._normalized_names, strict=True):
+            # rapidfuzz scores two empty strings as a perfect match
+            if not normalized_name or not speaker_normalized:
+                continue
 
-        for speaker in all_speakers:
-            speaker_normalized = self._normalize_name(speaker.name)
             score = fuzz.ratio(normalized_name, speaker_normalized)
 
             # Check role disambiguation if both have roles
-            if role and speaker.role:
-                role_similarity = fuzz.ratio(role.lower(), speaker.role.lower())
+            if role_lower and speaker.role:
+                role_similarity = fuzz.ratio(role_lower, speaker.role.lower())
                 # If roles are very different, probably different people
                 if role_similarity < 50:
                     continue
@@ -149,18 +206,18 @@ class SpeakerService:
             # Avoid ambiguous matches (top 2 within 5 points)
             if second_best_score > 0 and (best_score - second_best_score) < 5:
                 # Ambiguous - use role for final disambiguation
-                if role and best_match.role:
-                    role_sim_best = fuzz.ratio(role.lower(), best_match.role.lower())
+                if role_lower and best_match.role:
+                    role_sim_best = fuzz.ratio(role_lower, best_match.role.lower())
                     # Could get second best here for comparison
                     return best_match if role_sim_best >= 70 else None
                 return None  # Too ambiguous without role
             return best_match
 
         # Stage 3: Surname + role matching
-        if role:
+        if role_lower:
             for speaker in all_speakers:
                 if self._surname_matches(name, speaker.name):
-                    if speaker.role and fuzz.ratio(role.lower(), speaker.role.lower()) >= 70:
+                    if speaker.role and fuzz.ratio(role_lower, speaker.role.lower()) >= 70:
                         return speaker
 
         return None
@@ -192,6 +249,13 @@ class SpeakerService:
 
         self.session.add(speaker)
         await self.session.flush()
+
+        # Keep the cached snapshot current so later lookups see this speaker
+        if self._all_speakers is not None:
+            normalized = self._normalize_name(name)
+            self._all_speakers.append(speaker)
+            self._normalized_names.append(normalized)
+            self._speakers_by_name.setdefault(normalized, speaker)
         return speaker
 
     async def _update_speaker(
@@ -233,47 +297,7 @@ class SpeakerService:
 
         Removes titles, punctuation, and converts to lowercase.
         """
-        titles = [
-            "hon.",
-            "honourable",
-            "the honourable",
-            "the hon.",
-            "dr.",
-            "dr",
-            "mr.",
-            "mr",
-            "mrs.",
-            "mrs",
-            "ms.",
-            "ms",
-            "miss",
-            "sir",
-            "dame",
-            "prof.",
-            "professor",
-            "senator",
-            "sen.",
-            "mp",
-            "k.c.",
-            "kc",
-            "rev.",
-            "rev",
-        ]
-
-        normalized = name.lower().strip()
-
-        # Remove titles
-        for title in titles:
-            if normalized.startswith(title + " "):
-                normalized = normalized[len(title) :].strip()
-            if normalized.startswith(title):
-                normalized = normalized[len(title) :].strip()
-
-        # Remove extra whitespace and punctuation
-        normalized = re.sub(r"[^\w\s-]", "", normalized)
-        normalized = re.sub(r"\s+", " ", normalized).strip()
-
-        return normalized
+        return _normalize_speaker_name(name)
 
     def _surname_matches(self, name1: str, name2: str) -> bool:
         """Check if two names have the same surname."""
@@ -286,8 +310,16 @@ class SpeakerService:
         if self._all_speakers is None:
             result = await self.session.execute(select(Speaker))
             self._all_speakers = list(result.scalars().all())
+
+            # Normalize every name once; index them for exact lookups (first speaker wins)
+            self._normalized_names = [self._normalize_name(s.name) for s in self._all_speakers]
+            self._speakers_by_name = {}
+            for normalized, speaker in zip(self._normalized_names, self._all_speakers, strict=True):
+                self._speakers_by_name.setdefault(normalized, speaker)
         return self._all_speakers
 
     async def refresh_cache(self) -> None:
         """Refresh speaker cache (call after bulk operations)."""
         self._all_speakers = None
+        self._normalized_names = []
+        self._speakers_by_name = {}
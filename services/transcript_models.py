@@ -7,7 +7,7 @@ from typing import Any
 from core.utils import convert_time_to_seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptSentence:
     """A single sentence with timestamp from transcript."""
 
@@ -20,7 +20,7 @@ class TranscriptSentence:
         return convert_time_to_seconds(self.start_time)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptSpeechBlock:
     """Speech by a single speaker."""
 
@@ -33,7 +33,7 @@ class TranscriptSpeechBlock:
         return " ".join(s.text for s in self.sentences)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptAgendaItem:
     """Agenda item with speeches."""
 
@@ -49,7 +49,7 @@ class TranscriptAgendaItem:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class StructuredTranscript:
     """Complete structured transcript with provenance."""
 
@@ -1,5 +1,6 @@
 """Unified ingestion pipeline with chunked processing and provenance tracking."""
 
+import asyncio
 import json
 from dataclasses import dataclass, field
 from datetime import date
@@ -19,7 +20,13 @@ from models.speaker import Speaker
 from models.transcript_sentence import TranscriptSentence as TranscriptSentenceModel
 from models.video import Video
 from parsers.order_paper_parser import OrderPaperParser
-from services.chunked_processor import ChunkedTranscriptProcessor, SpeechBlock, Sentence
+from services.chunked_processor import (
+    ChunkedTranscriptProcessor,
+    ChunkEntity,
+    ChunkRelationship,
+    SpeechBlock,
+    Sentence,
+)
 from services.embeddings import EmbeddingService
 from services.gemini import GeminiClient
 from services.schemas import TRANSCRIPT_SCHEMA
@@ -33,6 +40,27 @@ from services.transcript_models import (
 
 settings = get_settings()
 
+# Static part of the transcription prompt, built once at import time
+_TRANSCRIPT_INSTRUCTIONS = """Extract the complete transcript with:
+1. **session_title**: Full session title
+2. **agenda_items**: List of agenda topics discussed
+3. For each agenda item:
+   - **topic_title**: Title of the topic
+   - **speech_blocks**: Speeches by different speakers
+4. For each speech block:
+   - **speaker_name**: Name as mentioned in the video
+   - **sentences**: Individual sentences with timestamps
+5. For each sentence:
+   - **start_time**: Timestamp in XmYs format (e.g., "5m30s", "1h15m20s")
+   - **text**: The spoken text
+
+Important:
+- Use XmYs format for timestamps (e.g., "5m30s" for 5 minutes 30 seconds)
+- Preserve speaker names exactly as spoken
+- Break speeches into logical sentences
+- Include all content without summarization
+"""
+
 
 @dataclass
 class IngestionResult:
@@ -63,6 +91,7 @@ class UnifiedIngestionPipeline:
         session: AsyncSession,
         gemini_client: GeminiClient,
         verbose: bool = False,
+        max_concurrent_extractions: int = 4,
     ) -> None:
         """
         Initialize ingestion pipeline.
@@ -71,6 +100,7 @@ class UnifiedIngestionPipeline:
             session: Database session
             gemini_client: Gemini client for LLM operations
             verbose: Enable detailed logging
+            max_concurrent_extractions: Maximum agenda items extracted at once
         """
         self.session = session
         self.gemini_client = gemini_client
@@ -78,6 +108,7 @@ class UnifiedIngestionPipeline:
         self.chunked_processor = ChunkedTranscriptProcessor(gemini_client)
         self.embedding_service = EmbeddingService(gemini_client)
         self.verbose = verbose
+        self.max_concurrent_extractions = max_concurrent_extractions
 
     async def ingest_video(
         self,
@@ -193,7 +224,7 @@ class UnifiedIngestionPipeline:
             if self.verbose:
                 print("[Step 4/6] Processing speakers with deduplication...")
 
-            speaker_stats = await self._process_speakers(
+            speaker_stats, speakers = await self._process_speakers(
                 transcript=transcript,
                 chamber=chamber,
                 session_id=result.session_id,
@@ -229,6 +260,7 @@ class UnifiedIngestionPipeline:
                 transcript=transcript,
                 session_id=result.session_id,
                 video_id=video_id,
+                speakers=speakers,
             )
 
             if self.verbose:
@@ -285,10 +317,10 @@ class UnifiedIngestionPipeline:
         # Build prompt with context
         speaker_context = ""
         if order_paper_speakers:
-            speaker_names = [s.get("name", "") for s in order_paper_speakers]
-            speaker_context = f"\n\nExpected speakers: {', '.join(speaker_names)}"
+            speaker_names = ", ".join(s.get("name", "") for s in order_paper_speakers)
+            speaker_context = f"\n\nExpected speakers: {speaker_names}"
             if self.verbose:
-                print(f"[Transcript] Expected speakers: {', '.join(speaker_names)}")
+                print(f"[Transcript] Expected speakers: {speaker_names}")
 
         prompt = f"""Transcribe this Barbados parliamentary session video.
 
@@ -298,32 +330,14 @@ Session Information:
 - Sitting: {sitting_number or "Unknown"}
 {speaker_context}
 
-Extract the complete transcript with:
-1. **session_title**: Full session title
-2. **agenda_items**: List of agenda topics discussed
-3. For each agenda item:
-   - **topic_title**: Title of the topic
-   - **speech_blocks**: Speeches by different speakers
-4. For each speech block:
-   - **speaker_name**: Name as mentioned in the video
-   - **sentences**: Individual sentences with timestamps
-5. For each sentence:
-   - **start_time**: Timestamp in XmYs format (e.g., "5m30s", "1h15m20s")
-   - **text**: The spoken text
-
-Important:
-- Use XmYs format for timestamps (e.g., "5m30s" for 5 minutes 30 seconds)
-- Preserve speaker names exactly as spoken
-- Break speeches into logical sentences
-- Include all content without summarization
-"""
+{_TRANSCRIPT_INSTRUCTIONS}"""
 
         # Extract with structured output
         if self.verbose:
             print(f"[Transcript] Sending to Gemini API...")
             print()
 
-        response = self.gemini_client.analyze_video_with_transcript(
+        response = await self.gemini_client.aanalyze_video_with_transcript(
             video_url=video_url,
             prompt=prompt,
             response_schema=TRANSCRIPT_SCHEMA,
@@ -437,12 +451,15 @@ Important:
         transcript: StructuredTranscript,
         session_id: str,
         video_id: str,
+        speakers: dict[str, Speaker],
     ) -> None:
         """
         Create transcript sentence records with normalized speakers.
 
+        Speakers come from _process_speakers, keyed by transcript speaker name.
+
         For each sentence:
-        1. Lookup/create normalized speaker
+        1. Lookup normalized speaker
         2. Store full text with timestamps (seconds only)
         3. Generate embedding for semantic search
         4. Generate full-text vector for keyword search
@@ -455,12 +472,8 @@ Important:
         total_sentences = 0
         for agenda_idx, agenda_item in enumerate(transcript.agenda_items):
             for speech_idx, speech_block in enumerate(agenda_item.speech_blocks):
-                # Lookup/create normalized speaker for every speech block
-                speaker = await self.speaker_service.get_or_create_speaker(
-                    name=speech_block.speaker_name,
-                    chamber=transcript.chamber,
-                    session_id=session_id,
-                )
+                # Reuse the speaker already resolved for this name
+                speaker = speakers[speech_block.speaker_name]
 
                 # Store each sentence
                 for sentence_idx, sentence in enumerate(speech_block.sentences):
@@ -500,12 +513,17 @@ Important:
         transcript: StructuredTranscript,
         chamber: str,
         session_id: str,
-    ) -> dict[str, int]:
-        """Process speakers with deduplication."""
+    ) -> tuple[dict[str, int], dict[str, Speaker]]:
+        """
+        Process speakers with deduplication.
+
+        Returns:
+            Tuple of (stats, speakers keyed by transcript speaker name)
+        """
         stats = {"created": 0, "matched": 0}
 
         # Collect unique speakers from transcript
-        unique_speakers: dict[str, str] = {}  # name -> canonical_id
+        unique_speakers: dict[str, Speaker] = {}
 
         for agenda_item in transcript.agenda_items:
             for speech_block in agenda_item.speech_blocks:
@@ -519,7 +537,7 @@ Important:
                         session_id=session_id,
                     )
 
-                    unique_speakers[speaker_name] = speaker.canonical_id
+                    unique_speakers[speaker_name] = speaker
 
                     # Update stats: created if this is the first session for this speaker
                     if session_id not in speaker.session_ids:
@@ -528,9 +546,9 @@ Important:
                         stats["matched"] += 1
 
                 # Set canonical ID on speech block
-                speech_block.speaker_id = unique_speakers[speaker_name]
+                speech_block.speaker_id = unique_speakers[speaker_name].canonical_id
 
-        return stats
+        return stats, unique_speakers
 
     async def _create_agenda_items(
         self,
@@ -564,18 +582,16 @@ Important:
         all_relationships: list[Relationship] = []
         all_mentions: list[Mention] = []
 
+        # Entities loaded or created so far, by entity_id
+        known_entities: dict[str, Entity] = {}
+
         if self.verbose:
             print(f"[KG Extraction] Processing {len(transcript.agenda_items)} agenda items")
             print()
 
-        # Process each agenda item
-        for agenda_idx, agenda_item in enumerate(transcript.agenda_items):
-            if self.verbose:
-                print(
-                    f"[KG Extraction] Agenda item {agenda_idx + 1}/{len(transcript.agenda_items)}: {agenda_item.topic_title}"
-                )
-            # Convert to speech blocks for chunked processor
-            speech_blocks = [
+        # Convert each agenda item to speech blocks for the chunked processor
+        agenda_speech_blocks = [
+            [
                 SpeechBlock(
                     speaker_name=block.speaker_name,
                     speaker_id=block.speaker_id,
@@ -589,24 +605,61 @@ Important:
                 )
                 for block in agenda_item.speech_blocks
             ]
+            for agenda_item in transcript.agenda_items
+        ]
 
-            # Process in chunks
-            if self.verbose:
-                print(f"[KG Extraction]   Processing {len(speech_blocks)} speech blocks...")
+        semaphore = asyncio.Semaphore(self.max_concurrent_extractions)
+
+        async def extract(
+            agenda_idx: int, agenda_item: TranscriptAgendaItem, speech_blocks: list[SpeechBlock]
+        ) -> tuple[list[ChunkEntity], list[ChunkRelationship]]:
+            async with semaphore:
+                if self.verbose:
+                    print(
+                        f"[KG Extraction] Agenda item {agenda_idx + 1}/{len(transcript.agenda_items)}: {agenda_item.topic_title}"
+                    )
+                    print(f"[KG Extraction]   Processing {len(speech_blocks)} speech blocks...")
+                return await self.chunked_processor.aprocess_transcript(
+                    agenda_item_title=agenda_item.topic_title,
+                    speech_blocks=speech_blocks,
+                )
 
-            chunk_entities, chunk_relationships = self.chunked_processor.process_transcript(
-                agenda_item_title=agenda_item.topic_title,
-                speech_blocks=speech_blocks,
+        # Agenda items are independent, so extract them concurrently; storing
+        # the results touches the session, so that is still done one at a time
+        extractions = await asyncio.gather(
+            *(
+                extract(agenda_idx, agenda_item, speech_blocks)
+                for agenda_idx, (agenda_item, speech_blocks) in enumerate(
+                    zip(transcript.agenda_items, agenda_speech_blocks, strict=True)
+                )
             )
+        )
 
+        # Store each agenda item's entities and relationships
+        for agenda_idx, (speech_blocks, (chunk_entities, chunk_relationships)) in enumerate(
+            zip(agenda_speech_blocks, extractions, strict=True)
+        ):
             if self.verbose:
                 print(
-                    f"[KG Extraction]   Found {len(chunk_entities)} entities, {len(chunk_relationships)} relationships"
+                    f"[KG Extraction] Agenda item {agenda_idx + 1}: found {len(chunk_entities)} entities, {len(chunk_relationships)} relationships"
                 )
 
+            # Flat sentence index -> (speech block index, block, sentence), built
+            # once so mentions and relationships resolve their sentence directly
+            sentence_locations = [
+                (sb_idx, block, sentence)
+                for sb_idx, block in enumerate(speech_blocks)
+                for sentence in block.sentences
+            ]
+
+            # Load all already-stored entities for this agenda item in one query
+            await self._prefetch_entities(
+                {chunk_entity.entity_id for chunk_entity in chunk_entities}, known_entities
+            )
+
             # Convert chunk entities to database entities
             for chunk_entity in chunk_entities:
-                entity = await self._get_or_create_entity(chunk_entity)
+                entity = self._get_or_create_entity(chunk_entity, known_entities)
                 all_entities.append(entity)
 
                 # Create mentions for this entity
@@ -615,7 +668,7 @@ Important:
                         entity=entity,
                         mention_data=mention_data,
                         agenda_idx=agenda_idx,
-                        speech_blocks=speech_blocks,
+                        sentence_locations=sentence_locations,
                         session_id=session_id,
                         video_id=video_id,
                     )
@@ -625,12 +678,20 @@ Important:
             # Flush all entities to ensure they exist in the database
             await self.session.flush()
 
+            # Load relationship endpoints not extracted as entities in one query
+            await self._prefetch_entities(
+                {chunk_rel.source_id for chunk_rel in chunk_relationships}
+                | {chunk_rel.target_id for chunk_rel in chunk_relationships},
+                known_entities,
+            )
+
             # Convert chunk relationships to database relationships
             for chunk_rel in chunk_relationships:
-                relationship = await self._create_relationship(
+                relationship = self._create_relationship(
                     chunk_rel=chunk_rel,
+                    known_entities=known_entities,
                     agenda_idx=agenda_idx,
-                    speech_blocks=speech_blocks,
+                    sentence_locations=sentence_locations,
                     session_id=session_id,
                     video_id=video_id,
                 )
@@ -643,16 +704,32 @@ Important:
 
         return stats
 
-    async def _get_or_create_entity(
+    async def _prefetch_entities(
+        self,
+        entity_ids: set[str],
+        known_entities: dict[str, Entity],
+    ) -> None:
+        """Load stored entities not yet in known_entities with a single WHERE IN query."""
+        missing_ids = entity_ids - known_entities.keys()
+        if not missing_ids:
+            return
+
+        result = await self.session.execute(select(Entity).where(Entity.entity_id.in_(missing_ids)))
+        for entity in result.scalars():
+            known_entities[entity.entity_id] = entity
+
+    def _get_or_create_entity(
         self,
         chunk_entity: Any,
+        known_entities: dict[str, Entity],
     ) -> Entity:
-        """Get existing entity or create new one."""
-        # Check if entity exists
-        result = await self.session.execute(
-            select(Entity).where(Entity.entity_id == chunk_entity.entity_id)
-        )
-        existing = result.scalar_one_or_none()
+        """
+        Get existing entity or create new one.
+
+        known_entities must already hold any stored entity with this ID
+        (see _prefetch_entities); newly created entities are added to it.
+        """
+        existing = known_entities.get(chunk_entity.entity_id)
 
         if existing:
             # Merge aliases
@@ -673,7 +750,7 @@ Important:
             source="extraction",
         )
         self.session.add(entity)
-        await self.session.flush()
+        known_entities[entity.entity_id] = entity
         return entity
 
     def _create_mention(
@@ -681,7 +758,7 @@ Important:
         entity: Entity,
         mention_data: dict,
         agenda_idx: int,
-        speech_blocks: list[SpeechBlock],
+        sentence_locations: list[tuple[int, SpeechBlock, Sentence]],
         session_id: str,
         video_id: str,
     ) -> Mention | None:
@@ -689,24 +766,9 @@ Important:
         sentence_idx = mention_data.get("sentence_index", 0)
 
         # Find the speech block and sentence
-        current_idx = 0
-        target_block: SpeechBlock | None = None
-        target_sentence: Sentence | None = None
-        speech_block_idx = 0
-
-        for sb_idx, block in enumerate(speech_blocks):
-            for s_idx, sentence in enumerate(block.sentences):
-                if current_idx == sentence_idx:
-                    target_block = block
-                    target_sentence = sentence
-                    speech_block_idx = sb_idx
-                    break
-                current_idx += 1
-            if target_block:
-                break
-
-        if not target_block or not target_sentence:
+        if not isinstance(sentence_idx, int) or not 0 <= sentence_idx < len(sentence_locations):
             return None
+        speech_block_idx, target_block, target_sentence = sentence_locations[sentence_idx]
 
         # Convert timestamp to seconds
         ts_seconds = convert_time_to_seconds(target_sentence.start_time)
@@ -727,10 +789,18 @@ Important:
         self.session.add(mention)
         return mention
 
-    async def _ensure_entity_exists(self, entity_id: str) -> Entity:
-        """Ensure an entity exists in the database, creating if necessary."""
-        result = await self.session.execute(select(Entity).where(Entity.entity_id == entity_id))
-        existing = result.scalar_one_or_none()
+    def _ensure_entity_exists(
+        self,
+        entity_id: str,
+        known_entities: dict[str, Entity],
+    ) -> Entity:
+        """
+        Ensure an entity exists in the database, creating if necessary.
+
+        known_entities must already hold any stored entity with this ID
+        (see _prefetch_entities); newly created entities are added to it.
+        """
+        existing = known_entities.get(entity_id)
 
         if existing:
             return existing
@@ -747,14 +817,15 @@ Important:
             source="extraction",
         )
         self.session.add(entity)
-        await self.session.flush()
+        known_entities[entity_id] = entity
         return entity
 
-    async def _create_relationship(
+    def _create_relationship(
         self,
         chunk_rel: Any,
+        known_entities: dict[str, Entity],
         agenda_idx: int,
-        speech_blocks: list[SpeechBlock],
+        sentence_locations: list[tuple[int, SpeechBlock, Sentence]],
         session_id: str,
         video_id: str,
     ) -> Relationship | None:
@@ -762,31 +833,16 @@ Important:
         sentence_idx = chunk_rel.evidence_sentence_index
 
         # Find the speech block and sentence
-        current_idx = 0
-        target_block: SpeechBlock | None = None
-        target_sentence: Sentence | None = None
-        speech_block_idx = 0
-
-        for sb_idx, block in enumerate(speech_blocks):
-            for s_idx, sentence in enumerate(block.sentences):
-                if current_idx == sentence_idx:
-                    target_block = block
-                    target_sentence = sentence
-                    speech_block_idx = sb_idx
-                    break
-                current_idx += 1
-            if target_block:
-                break
-
-        if not target_block or not target_sentence:
+        if not isinstance(sentence_idx, int) or not 0 <= sentence_idx < len(sentence_locations):
             return None
+        speech_block_idx, target_block, target_sentence = sentence_locations[sentence_idx]
 
         # Convert timestamp to seconds
         ts_seconds = convert_time_to_seconds(target_sentence.start_time)
 
         # Ensure source and target entities exist
-        await self._ensure_entity_exists(chunk_rel.source_id)
-        await self._ensure_entity_exists(chunk_rel.target_id)
+        self._ensure_entity_exists(chunk_rel.source_id, known_entities)
+        self._ensure_entity_exists(chunk_rel.target_id, known_entities)
 
         relationship = Relationship(
             source_entity_id=chunk_rel.source_id,
@@ -0,0 +1,103 @@
+"""Shared fixtures for service tests."""
+
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+from services import gemini as gemini_module
+
+
+class DummyFiles:
+    """Stub files handler counting uploads."""
+
+    def __init__(self) -> None:
+        self.uploads = 0
+
+    def upload(self, file: str) -> str:
+        self.uploads += 1
+        return f"file-{self.uploads}"
+
+
+class DummyModels:
+    """
+    Stub models handler recording calls.
+
+    generate_content returns respond(contents, config), which by default
+    returns response; tests replace either to shape the reply, or set error
+    to make every call raise. Embeddings are [len(text), 1.0] per text.
+    """
+
+    def __init__(self) -> None:
+        self.configs: list[Any] = []
+        self.embed_batches: list[list[str]] = []
+        self.response = SimpleNamespace(text="{}", parsed=None, usage_metadata=None)
+        self.respond: Callable[[Any, Any], Any] = lambda contents, config: self.response
+        self.error: Exception | None = None
+
+    @property
+    def generate_calls(self) -> int:
+        return len(self.configs)
+
+    @property
+    def embedded(self) -> list[str]:
+        return [text for batch in self.embed_batches for text in batch]
+
+    def generate_content(self, model: str, contents: Any, config: Any) -> Any:
+        self.configs.append(config)
+        if self.error is not None:
+            raise self.error
+        return self.respond(contents, config)
+
+    def embed_content(self, model: str, contents: list[str]) -> SimpleNamespace:
+        self.embed_batches.append(list(contents))
+        return SimpleNamespace(
+            embeddings=[SimpleNamespace(values=[float(len(text)), 1.0]) for text in contents],
+            usage_metadata=None,
+        )
+
+
+class DummyAioModels:
+    """Async view of DummyModels; streams reply text in 10-character chunks."""
+
+    def __init__(self, models: DummyModels) -> None:
+        self._models = models
+
+    async def generate_content(self, model: str, contents: Any, config: Any) -> Any:
+        return self._models.generate_content(model, contents, config)
+
+    async def generate_content_stream(self, model: str, contents: Any, config: Any) -> Any:
+        text = self._models.generate_content(model, contents, config).text
+
+        async def stream():  # type: ignore[no-untyped-def]
+            for i in range(0, len(text), 10):
+                yield SimpleNamespace(text=text[i : i + 10], usage_metadata=None)
+
+        return stream()
+
+
+class DummyClient:
+    """Stub Gemini API client."""
+
+    def __init__(self, api_key: str) -> None:
+        self.api_key = api_key
+        self.files = DummyFiles()
+        self.models = DummyModels()
+        self.aio = SimpleNamespace(models=DummyAioModels(self.models))
+
+
+@pytest.fixture
+def make_gemini_client(monkeypatch):  # type: ignore[no-untyped-def]
+    """Return a factory for GeminiClients backed by DummyClient."""
+    monkeypatch.setattr(gemini_module.genai, "Client", DummyClient)
+
+    def make(**kwargs: Any) -> gemini_module.GeminiClient:
+        return gemini_module.GeminiClient(api_key="test-key", **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def gemini_client(make_gemini_client):  # type: ignore[no-untyped-def]
+    """GeminiClient with default settings backed by DummyClient."""
+    return make_gemini_client()
@@ -0,0 +1,114 @@
+"""Tests for chunked transcript extraction."""
+
+import asyncio
+
+from services.chunked_processor import ChunkedTranscriptProcessor, Sentence, SpeechBlock
+from services.schemas import CHUNK_EXTRACTION_SCHEMA
+
+
+class StubGeminiClient:
+    """Stub Gemini client returning a fixed combined extraction."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def generate_structured(self, prompt: str, response_schema: dict, stage: str) -> dict:
+        self.calls.append({"schema": response_schema, "stage": stage})
+        return {
+            "entities": [
+                {
+                    "entity_id": "bill_cybercrime",
+                    "entity_type": "law",
+                    "name": "Cybercrime Bill",
+                    "canonical_name": "Cybercrime Bill",
+                }
+            ],
+            "relationships": [
+                {
+                    "source_id": "Jane Doe",
+                    "target_id": "bill_cybercrime",
+                    "relation_type": "supports",
+                    "sentiment": "positive",
+                    "evidence": "I support this Bill.",
+                    "evidence_sentence_index": 0,
+                },
+                {
+                    "source_id": "Jane Doe",
+                    "target_id": "unknown_entity",
+                    "relation_type": "mentions",
+                    "sentiment": "neutral",
+                    "evidence": "I support this Bill.",
+                    "evidence_sentence_index": 0,
+                },
+            ],
+        }
+
+
+def test_single_pass_extraction_uses_one_request_per_chunk():
+    """Entities and relationships should come from a single combined request."""
+    client = StubGeminiClient()
+    processor = ChunkedTranscriptProcessor(client)  # type: ignore[arg-type]
+    blocks = [
+        SpeechBlock(speaker_name="Jane Doe", sentences=[Sentence("0m0s", "I support this Bill.")])
+    ]
+
+    entities, relationships = processor.process_transcript("Cybercrime Bill", blocks)
+
+    assert len(client.calls) == 1
+    assert client.calls[0]["schema"] is CHUNK_EXTRACTION_SCHEMA
+    assert [e.entity_id for e in entities] == ["bill_cybercrime"]
+    # Relationships pointing at entities that were not extracted are dropped
+    assert [(r.source_id, r.target_id) for r in relationships] == [("Jane Doe", "bill_cybercrime")]
+
+
+def test_chunk_speakers_keep_first_appearance_order():
+    """Speaker names should be unique and listed in the order they first speak."""
+    processor = ChunkedTranscriptProcessor(StubGeminiClient())  # type: ignore[arg-type]
+    blocks = [
+        SpeechBlock(speaker_name=name, sentences=[Sentence("0m0s", f"{name} speaks.")])
+        for name in ["Speaker", "Jane Doe", "Speaker", "John Roe", "Jane Doe"]
+    ]
+
+    chunks = processor.create_chunks("Cybercrime Bill", blocks)
+
+    assert chunks[0].speaker_names == ["Speaker", "Jane Doe", "John Roe"]
+
+
+class AsyncStubGeminiClient(StubGeminiClient):
+    """Stub client exposing the async structured generation call."""
+
+    async def agenerate_structured(self, prompt: str, response_schema: dict, stage: str) -> dict:
+        return self.generate_structured(prompt, response_schema, stage)
+
+
+def test_aprocess_transcript_matches_sync_extraction():
+    """The async variant should return the same extraction as process_transcript."""
+    client = AsyncStubGeminiClient()
+    processor = ChunkedTranscriptProcessor(client)  # type: ignore[arg-type]
+    blocks = [
+        SpeechBlock(speaker_name="Jane Doe", sentences=[Sentence("0m0s", "I support this Bill.")])
+    ]
+
+    entities, relationships = asyncio.run(processor.aprocess_transcript("Cybercrime Bill", blocks))
+
+    assert client.calls[0]["stage"] == "chunk_extraction"
+    assert [e.entity_id for e in entities] == ["bill_cybercrime"]
+    assert [(r.source_id, r.target_id) for r in relationships] == [("Jane Doe", "bill_cybercrime")]
+
+
+def test_entities_repeated_across_chunks_are_merged():
+    """Overlapping chunks should yield one entity per entity_id with merged mentions."""
+    client = StubGeminiClient()
+    processor = ChunkedTranscriptProcessor(client, chunk_size=2, overlap=1)  # type: ignore[arg-type]
+    blocks = [
+        SpeechBlock(
+            speaker_name="Jane Doe",
+            sentences=[Sentence(f"0m{i}s", "I support this Bill.") for i in range(3)],
+        )
+    ]
+
+    entities, relationships = processor.process_transcript("Cybercrime Bill", blocks)
+
+    assert len(client.calls) == 3
+    assert [e.entity_id for e in entities] == ["bill_cybercrime"]
+    assert len(relationships) == 3
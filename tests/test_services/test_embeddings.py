@@ -55,11 +55,46 @@ class TestEmbeddingService:
 
     def test_generate_embeddings_with_gemini_client(self):
         """Test embedding generation with Gemini client."""
+        import numpy as np
+
         mock_client = Mock()
-        mock_client.embed_texts.return_value = [[0.1, 0.2, 0.3]]
+        mock_client.embed_texts.return_value = np.array([[0.1, 0.2, 0.3]])
 
         service = EmbeddingService(gemini_client=mock_client)
         embeddings = service.generate_embeddings(["test text"])
 
         assert embeddings == [[0.1, 0.2, 0.3]]
         mock_client.embed_texts.assert_called_once()
+
+    def test_generate_embeddings_caches_repeated_texts(self):
+        """Texts embedded before should not be sent to the backend again."""
+        import numpy as np
+
+        mock_client = Mock()
+        mock_client.embed_texts.side_effect = lambda texts: np.array(
+            [[float(len(text))] for text in texts]
+        )
+
+        service = EmbeddingService(gemini_client=mock_client)
+        service.generate_embeddings(["a", "bb"])
+        embeddings = service.generate_embeddings(["bb", "ccc", "ccc", "a"])
+
+        assert embeddings == [[2.0], [3.0], [3.0], [1.0]]
+        assert mock_client.embed_texts.call_args_list[1].args == (["ccc"],)
+
+    def test_local_model_loaded_once(self):
+        """The sentence-transformers model should be loaded once and reused across batches."""
+        import numpy as np
+
+        mock_model = Mock()
+        mock_model.encode.side_effect = lambda texts, **kwargs: np.zeros((len(texts), 2))
+        mock_transformer = Mock(return_value=mock_model)
+        fake_module = Mock(SentenceTransformer=mock_transformer)
+
+        with patch.dict("sys.modules", {"sentence_transformers": fake_module}):
+            service = EmbeddingService()
+            embeddings = service.generate_batch(["text1", "text2", "text3"], batch_size=1)
+
+        assert len(embeddings) == 3
+        mock_transformer.assert_called_once_with("all-mpnet-base-v2")
+        assert mock_model.encode.call_count == 3
@@ -0,0 +1,231 @@
+"""Tests for entity deduplication candidate matching."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.entity_deduplication import EntityDeduplicationService
+
+
+def make_entity(  # type: ignore[no-untyped-def]
+    entity_id: str, entity_type: str, name: str, embedding
+):
+    return SimpleNamespace(
+        entity_id=entity_id,
+        entity_type=entity_type,
+        name=name,
+        canonical_name=name,
+        aliases=[],
+        embedding=embedding,
+    )
+
+
+class FakeSession:
+    """Stub session returning a fixed entity list."""
+
+    def __init__(self, entities: list) -> None:  # type: ignore[type-arg]
+        self.entities = entities
+
+    async def execute(self, statement):  # type: ignore[no-untyped-def]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.entities))
+
+    async def flush(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+def make_service() -> EntityDeduplicationService:
+    return EntityDeduplicationService(
+        session=None,  # type: ignore[arg-type]
+        gemini_client=None,  # type: ignore[arg-type]
+        embedding_service=object(),  # type: ignore[arg-type]
+    )
+
+
+def test_vector_similarity_blocks_handle_missing_embeddings():
+    """Cosine similarities should be exact and zero for entities without embeddings."""
+    entities = [
+        make_entity("a", "law", "A", np.array([1.0, 0.0])),
+        make_entity("b", "law", "B", np.array([3.0, 4.0])),
+        make_entity("c", "law", "C", None),
+    ]
+
+    blocks = list(make_service()._vector_similarity_blocks(entities, block_size=2))
+
+    assert [(start, block.shape) for start, block in blocks] == [(0, (2, 3)), (2, (1, 1))]
+    similarities = blocks[0][1]
+    np.testing.assert_allclose(similarities[0, 1], 0.6, rtol=1e-6)
+    assert similarities[0, 2] == similarities[1, 2] == blocks[1][1][0, 0] == 0.0
+
+
+def test_candidate_pairs_only_within_type():
+    """Pairs should only be proposed between entities of the same type."""
+    entities = [
+        make_entity("bill_1", "law", "Cybercrime Bill", [1.0, 0.0]),
+        make_entity("org_1", "organization", "Cybercrime Bill", [1.0, 0.0]),
+        make_entity("bill_2", "law", "Cybercrime Bill 2024", [0.99, 0.1]),
+    ]
+
+    pairs = asyncio.run(make_service()._find_candidate_pairs(entities))
+
+    assert [(p.entity1.entity_id, p.entity2.entity_id) for p in pairs] == [("bill_1", "bill_2")]
+    assert pairs[0].vector_score > 0.99
+
+
+def test_resolutions_run_concurrently_within_limit(monkeypatch):
+    """LLM resolutions should overlap, bounded by max_concurrent_resolutions."""
+    service = make_service()
+    service.max_concurrent_resolutions = 2
+    in_flight = 0
+    peak = 0
+
+    async def fake_resolve(match):  # type: ignore[no-untyped-def]
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"decision": "keep_separate"}
+
+    entities = [make_entity(f"law_{i}", "law", "Cybercrime Bill", [1.0, 0.0]) for i in range(4)]
+
+    service.session = FakeSession(entities)  # type: ignore[assignment]
+    monkeypatch.setattr(service, "_resolve_match", fake_resolve)
+
+    stats = asyncio.run(service.run_deduplication())
+
+    assert stats["kept_separate"] == 6
+    assert peak == 2
+
+
+def test_batch_skips_pairs_with_entities_merged_earlier(monkeypatch):
+    """A pair should not be merged once either entity was merged away in the same batch."""
+    service = make_service()
+    entities = [make_entity(f"law_{i}", "law", "Cybercrime Bill", [1.0, 0.0]) for i in range(3)]
+    merged: list[tuple[str, str]] = []
+
+    async def fake_resolve(match):  # type: ignore[no-untyped-def]
+        return {"decision": "merge"}
+
+    async def fake_merge(keep, merge, decision):  # type: ignore[no-untyped-def]
+        merged.append((keep.entity_id, merge.entity_id))
+
+    service.session = FakeSession(entities)  # type: ignore[assignment]
+    monkeypatch.setattr(service, "_resolve_match", fake_resolve)
+    monkeypatch.setattr(service, "_merge_entities", fake_merge)
+
+    stats = asyncio.run(service.run_deduplication())
+
+    # law_1 is merged into law_0 first, so the (law_1, law_2) pair is stale
+    assert merged == [("law_0", "law_1"), ("law_0", "law_2")]
+    assert stats["merged"] == 2
+    assert stats["skipped"] == 1
+    assert stats["entities_processed"] == 3
+
+
+def test_later_batches_skip_pairs_with_merged_entities(monkeypatch):
+    """Pairs in later batches should not be resolved once an entity was merged away."""
+    service = make_service()
+    service.batch_size = 1
+    entities = [make_entity(f"law_{i}", "law", "Cybercrime Bill", [1.0, 0.0]) for i in range(3)]
+    merged: list[tuple[str, str]] = []
+    resolved: list[tuple[str, str]] = []
+
+    async def fake_resolve(match):  # type: ignore[no-untyped-def]
+        resolved.append((match.entity1.entity_id, match.entity2.entity_id))
+        return {"decision": "merge"}
+
+    async def fake_merge(keep, merge, decision):  # type: ignore[no-untyped-def]
+        merged.append((keep.entity_id, merge.entity_id))
+
+    service.session = FakeSession(entities)  # type: ignore[assignment]
+    monkeypatch.setattr(service, "_resolve_match", fake_resolve)
+    monkeypatch.setattr(service, "_merge_entities", fake_merge)
+
+    stats = asyncio.run(service.run_deduplication())
+
+    assert merged == [("law_0", "law_1"), ("law_0", "law_2")]
+    assert ("law_1", "law_2") not in resolved
+    assert (
+        stats["entities_processed"] == stats["merged"] + stats["kept_separate"] + stats["skipped"]
+    )
+    assert stats["skipped"] == 1
+
+
+def test_fuzzy_score_blocks_use_best_name_pair():
+    """Fuzzy scores should be the best case-insensitive ratio over names and aliases."""
+    entities = [
+        make_entity("a", "law", "Cybercrime Bill", None),
+        make_entity("b", "law", "Computer Misuse Act", None),
+        make_entity("c", "law", "Road Traffic Act", None),
+    ]
+    entities[1].aliases = ["CYBERCRIME BILL"]
+
+    blocks = list(make_service()._fuzzy_score_blocks(entities, block_size=2))
+
+    # Rows 0-1 against entities 0-2, then row 2 against entity 2 only
+    assert [(start, block.shape) for start, block in blocks] == [(0, (2, 3)), (2, (1, 1))]
+    first = blocks[0][1]
+    assert first[0, 1] == first[1, 0] == 1.0
+    assert first[0, 2] < 0.5
+    assert blocks[1][1][0, 0] == 1.0
+
+
+def test_empty_aliases_do_not_match():
+    """Blank aliases must not make unrelated entities a perfect fuzzy match."""
+    entities = [
+        make_entity("a", "law", "Cybercrime Bill", None),
+        make_entity("b", "law", "Road Traffic Act", None),
+        make_entity("c", "law", "", None),
+    ]
+    entities[0].aliases = [""]
+    entities[1].aliases = ["", "  "]
+    service = make_service()
+
+    scores = next(service._fuzzy_score_blocks(entities))[1]
+
+    assert scores[0, 1] < service.fuzzy_threshold
+    assert scores[0, 2] == scores[1, 2] == scores[2, 2] == 0.0
+
+
+def test_candidate_pairs_independent_of_block_size(monkeypatch):
+    """Blocked scoring should find the same pairs whatever the block size."""
+    entities = [
+        make_entity(f"law_{i}", "law", name, [1.0, float(i % 3)])
+        for i, name in enumerate(
+            ["Cybercrime Bill", "Cybercrime Bill 2024", "Road Traffic Act", "Road Traffic Act"] * 3
+        )
+    ]
+    service = make_service()
+
+    def pair_ids() -> list[tuple[str, str, float]]:
+        pairs = asyncio.run(service._find_candidate_pairs(entities))
+        return sorted(
+            (p.entity1.entity_id, p.entity2.entity_id, round(p.hybrid_score, 5)) for p in pairs
+        )
+
+    expected = pair_ids()
+    monkeypatch.setattr(EntityDeduplicationService, "SCORE_BLOCK_SIZE", 5)
+
+    assert expected
+    assert pair_ids() == expected
+
+
+def test_hybrid_threshold_met_exactly_in_float32():
+    """A pair whose float64 hybrid score equals the threshold should still be kept."""
+    entities = [
+        make_entity("a", "law", "Cybercrime Bill", [1.0, 0.0]),
+        make_entity("b", "law", "Cybercrime Bills", [1.0, 0.1]),
+    ]
+    service = make_service()
+    fuzzy = next(service._fuzzy_score_blocks(entities))[1][0, 1]
+    service.fuzzy_threshold = service.vector_threshold = 1.1
+    # Computed in float64 this is exactly the pair's score; float32 rounds just below it
+    service.hybrid_threshold = 0.3 * float(fuzzy) + 0.7 / np.sqrt(1.01)
+
+    pairs = asyncio.run(service._find_candidate_pairs(entities))
+
+    assert [(p.entity1.entity_id, p.entity2.entity_id) for p in pairs] == [("a", "b")]
@@ -0,0 +1,13 @@
+"""Tests for Gemini generation config construction."""
+
+
+def test_generation_config_reused_per_schema(gemini_client):
+    """Configs should be built once per schema object and generation settings."""
+    schema = {"type": "object"}
+
+    config = gemini_client._generation_config(schema)
+    assert gemini_client._generation_config(schema) is config
+    assert gemini_client._generation_config({"type": "object"}) is not config
+
+    gemini_client.temperature = 0.5
+    assert gemini_client._generation_config(schema) is not config
@@ -0,0 +1,52 @@
+"""Tests for Gemini embedding output handling."""
+
+import asyncio
+
+import numpy as np
+
+from services import gemini as gemini_module
+from services.llm_cache import LLMCache
+
+
+def test_embed_texts_returns_float32_matrix(gemini_client):
+    """Embeddings should come back as a single (n, dim) float32 array."""
+    embeddings = gemini_client.embed_texts(["a", "bb"])
+
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (2, 2)
+    assert gemini_client.embed_texts_list(["a"]) == [[1.0, 1.0]]
+
+
+def test_embed_texts_batches_large_inputs(monkeypatch, gemini_client):
+    """Inputs larger than the batch size should be split and reassembled in order."""
+    monkeypatch.setattr(gemini_module.GeminiClient, "EMBED_BATCH_SIZE", 2)
+
+    embeddings = gemini_client.embed_texts(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert embeddings.shape == (5, 2)
+    assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert gemini_client.client.models.embed_batches == [
+        ["a", "bb"],
+        ["ccc", "dddd"],
+        ["eeeee"],
+    ]
+
+
+def test_embed_texts_normalized_float16(gemini_client):
+    """Normalized output should have unit rows in the requested dtype."""
+    embeddings = gemini_client.embed_texts(["a", "b"], normalize=True, dtype=np.float16)
+
+    assert embeddings.dtype == np.float16
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-3)
+
+
+def test_embed_texts_empty_input(make_gemini_client, tmp_path):
+    """Empty input should return an empty float32 array with or without a cache."""
+    for cache in (None, LLMCache(tmp_path)):
+        client = make_gemini_client(cache=cache)
+        embeddings = client.embed_texts([])
+        async_embeddings = asyncio.run(client.aembed_texts([]))
+
+        assert embeddings.shape[0] == async_embeddings.shape[0] == 0
+        assert embeddings.dtype == async_embeddings.dtype == np.float32
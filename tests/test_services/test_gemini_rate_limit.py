@@ -1,5 +1,7 @@
 """Tests for Gemini rate limiting utilities."""
 
+import asyncio
+
 from services.gemini import RateLimiter
 
 
@@ -22,3 +24,22 @@ def test_rate_limiter_sleeps_after_limit(monkeypatch):
     limiter.wait_if_needed()
 
     assert sleep_calls == [10.0]
+
+
+def test_rate_limiter_spaces_concurrent_reservations(monkeypatch):
+    """Queued async callers should be spread across successive periods."""
+    limiter = RateLimiter(max_calls=2, period=10.0)
+    sleep_calls = []
+
+    async def fake_sleep(duration):
+        sleep_calls.append(duration)
+
+    monkeypatch.setattr("services.gemini.time.time", lambda: 1000.0)
+    monkeypatch.setattr("services.gemini.asyncio.sleep", fake_sleep)
+
+    async def run_all():
+        await asyncio.gather(*(limiter.async_wait_if_needed() for _ in range(6)))
+
+    asyncio.run(run_all())
+
+    assert sorted(sleep_calls) == [10.0, 10.0, 20.0, 20.0]
@@ -0,0 +1,120 @@
+"""Tests for Gemini retry behaviour."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors as genai_errors
+
+from services import gemini as gemini_module
+
+
+def test_rate_limit_errors_back_off_exponentially(monkeypatch, gemini_client):
+    """429s should be retried with growing, jittered delays."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(gemini_module.time, "sleep", sleeps.append)
+    monkeypatch.setattr(gemini_module.random, "uniform", lambda a, b: 0.5)
+
+    calls = iter([genai_errors.ClientError(429, {}), genai_errors.ServerError(503, {}), "ok"])
+
+    def call() -> str:
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert gemini_client._call_with_retry(call, "test") == "ok"
+    assert sleeps == [2.5, 4.5]
+
+
+def test_json_errors_retry_without_sleeping(monkeypatch, gemini_client):
+    """Malformed JSON should be retried immediately."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(gemini_module.time, "sleep", sleeps.append)
+    attempts = []
+
+    def call() -> dict:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise json.JSONDecodeError("bad", "{", 0)
+        return {}
+
+    assert gemini_client._call_with_retry(call, "test") == {}
+    assert sleeps == []
+
+
+def test_client_errors_are_not_retried(gemini_client):
+    """Non-transient API errors should be raised on the first attempt."""
+    attempts = []
+
+    def call() -> None:
+        attempts.append(1)
+        raise genai_errors.ClientError(400, {})
+
+    with pytest.raises(genai_errors.ClientError):
+        gemini_client._call_with_retry(call, "test")
+    assert len(attempts) == 1
+
+
+def test_schema_constrained_json_errors_are_not_retried(gemini_client):
+    """Parse failures under a response schema should not trigger another generation."""
+    models = gemini_client.client.models
+    models.response = SimpleNamespace(text='{"truncated": ', parsed=None, usage_metadata=None)
+
+    with pytest.raises(json.JSONDecodeError):
+        gemini_client.generate_structured("prompt", {"type": "object"})
+    assert models.generate_calls == 1
+    assert models.configs[0].response_mime_type == "application/json"
+
+
+def test_server_retry_delay_is_honoured(monkeypatch, gemini_client):
+    """A RetryInfo delay longer than the backoff should be waited out."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(gemini_module.time, "sleep", sleeps.append)
+    monkeypatch.setattr(gemini_module.random, "uniform", lambda a, b: 0.5)
+
+    retry_info = {
+        "error": {
+            "code": 429,
+            "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "37s"}],
+        }
+    }
+    calls = iter([genai_errors.ClientError(429, retry_info), "ok"])
+
+    def call() -> str:
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert gemini_client._call_with_retry(call, "test") == "ok"
+    assert sleeps == [37.5]
+
+
+@pytest.mark.parametrize(
+    ("retry_delay", "expected"), [("3600s", 60.5), ("-5s", 2.5), ("NaNs", 2.5)]
+)
+def test_server_retry_delay_is_clamped(monkeypatch, gemini_client, retry_delay, expected):
+    """Oversized server delays are capped and negative or NaN ones ignored."""
+    sleeps: list[float] = []
+    monkeypatch.setattr(gemini_module.time, "sleep", sleeps.append)
+    monkeypatch.setattr(gemini_module.random, "uniform", lambda a, b: 0.5)
+
+    retry_info = {
+        "error": {
+            "code": 429,
+            "details": [
+                {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": retry_delay}
+            ],
+        }
+    }
+    calls = iter([genai_errors.ClientError(429, retry_info), "ok"])
+
+    def call() -> str:
+        result = next(calls)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert gemini_client._call_with_retry(call, "test") == "ok"
+    assert sleeps == [expected]
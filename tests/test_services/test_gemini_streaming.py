@@ -0,0 +1,47 @@
+"""Tests for streamed Gemini entity extraction."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from services import gemini as gemini_module
+
+DOCUMENT = {
+    "title": "entities",
+    "notes": ["[not", "an {array}"],
+    "entities": [
+        {"entity_id": "e1", "name": 'Say "hi" {x}'},
+        {"entity_id": "e2", "aliases": ["a", "b"], "meta": {"nested": [1, 2]}},
+    ],
+    "relationships": [{"source": "e1"}],
+}
+
+
+def feed_in_chunks(text: str, size: int) -> list[dict]:
+    scanner = gemini_module._ArrayElementScanner("entities")
+    elements: list[dict] = []
+    for i in range(0, len(text), size):
+        elements.extend(scanner.feed(text[i : i + size]))
+    return elements
+
+
+def test_scanner_yields_complete_elements_across_chunk_boundaries():
+    """Elements should be recovered regardless of where chunks split the text."""
+    text = json.dumps(DOCUMENT, indent=1)
+    for size in (1, 3, 7, len(text)):
+        assert feed_in_chunks(text, size) == DOCUMENT["entities"]
+
+
+def test_aextract_entities_streaming(gemini_client):
+    """The streaming API should yield each entity in order."""
+    gemini_client.client.models.response = SimpleNamespace(text=json.dumps(DOCUMENT))
+
+    async def collect() -> list[dict]:
+        return [
+            entity
+            async for entity in gemini_client.aextract_entities_streaming(
+                transcript_data={"agenda_items": []}, prompt="Extract entities"
+            )
+        ]
+
+    assert asyncio.run(collect()) == DOCUMENT["entities"]
@@ -0,0 +1,60 @@
+"""Tests for Gemini file upload reuse."""
+
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors as genai_errors
+
+
+def respond_unless_stale(stale_files: set[str]):  # type: ignore[no-untyped-def]
+    """Build a reply hook that rejects the given file handles as expired."""
+
+    def respond(contents, config):  # type: ignore[no-untyped-def]
+        if contents[1] in stale_files:
+            message = f"You do not have permission to access the File {contents[1]}."
+            raise genai_errors.ClientError(403, {"error": {"message": message}})
+        return SimpleNamespace(text='{"file": "%s"}' % contents[1], usage_metadata=None)
+
+    return respond
+
+
+def test_pdf_uploaded_once_per_content(gemini_client, tmp_path):
+    """Repeated analyses of the same PDF should reuse the uploaded file."""
+    pdf_path = tmp_path / "paper.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+
+    gemini_client.client.models.respond = respond_unless_stale(set())
+    gemini_client.analyze_pdf_with_vision(pdf_path, "first pass")
+    result = gemini_client.analyze_pdf_with_vision(pdf_path, "second pass")
+
+    assert gemini_client.client.files.uploads == 1
+    assert result == {"file": "file-1"}
+
+
+def test_stale_upload_is_replaced(gemini_client, tmp_path):
+    """An expired remote file should be evicted and uploaded again."""
+    pdf_path = tmp_path / "paper.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+
+    stale_files: set[str] = set()
+    gemini_client.client.models.respond = respond_unless_stale(stale_files)
+    gemini_client.analyze_pdf_with_vision(pdf_path, "first pass")
+    stale_files.add("file-1")
+    result = gemini_client.analyze_pdf_with_vision(pdf_path, "second pass")
+
+    assert gemini_client.client.files.uploads == 2
+    assert result == {"file": "file-2"}
+
+
+def test_unrelated_forbidden_error_is_not_retried(gemini_client, tmp_path):
+    """A 403 that does not name the file should fail without re-uploading."""
+    pdf_path = tmp_path / "paper.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+
+    gemini_client.client.models.error = genai_errors.ClientError(
+        403, {"error": {"message": "Method doesn't allow unregistered callers."}}
+    )
+
+    with pytest.raises(genai_errors.ClientError):
+        gemini_client.analyze_pdf_with_vision(pdf_path, "first pass")
+    assert gemini_client.client.files.uploads == 1
@@ -5,29 +5,8 @@ from types import SimpleNamespace
 from services import gemini as gemini_module
 
 
-class DummyClient:
-    """Stub Gemini API client."""
-
-    def __init__(self, api_key: str) -> None:
-        self.api_key = api_key
-        self.models: "DummyModels | None" = None
-
-
-class DummyModels:
-    """Stub models handler."""
-
-    def __init__(self, response: SimpleNamespace) -> None:
-        self._response = response
-
-    def generate_content(self, model: str, contents, config):  # type: ignore[no-untyped-def]
-        return self._response
-
-
-def test_gemini_records_usage(monkeypatch):
+def test_gemini_records_usage(gemini_client):
     """Gemini client should record usage metadata."""
-    monkeypatch.setattr(gemini_module.genai, "Client", DummyClient)
-
-    client = gemini_module.GeminiClient(api_key="test-key")
     response = SimpleNamespace(
         usage_metadata=SimpleNamespace(
             prompt_token_count=12,
@@ -36,10 +15,10 @@ def test_gemini_records_usage(monkeypatch):
         )
     )
 
-    client._record_usage(response, stage="kg_entities", duration_ms=120.5)
+    gemini_client._record_usage(response, stage="kg_entities", duration_ms=120.5)
 
-    assert len(client.usage_log) == 1
-    usage = client.usage_log[0]
+    assert len(gemini_client.usage_log) == 1
+    usage = gemini_client.usage_log[0]
     assert usage["stage"] == "kg_entities"
     assert usage["prompt_tokens"] == 12
     assert usage["output_tokens"] == 34
@@ -47,27 +26,62 @@ def test_gemini_records_usage(monkeypatch):
     assert usage["duration_ms"] == 120.5
 
 
-def test_extract_entities_uses_parsed_response(monkeypatch):
+def test_extract_entities_uses_parsed_response(gemini_client):
     """Structured responses should use parsed payload when available."""
     parsed_payload = {"entities": [{"entity_id": "test-1"}]}
-    response = SimpleNamespace(
+    gemini_client.client.models.response = SimpleNamespace(
         text="{not valid json}",
         parsed=parsed_payload,
         usage_metadata=None,
     )
 
-    def dummy_client_factory(api_key: str):  # type: ignore[no-untyped-def]
-        client = DummyClient(api_key=api_key)
-        client.models = DummyModels(response)
-        return client
-
-    monkeypatch.setattr(gemini_module.genai, "Client", dummy_client_factory)
-
-    client = gemini_module.GeminiClient(api_key="test-key")
-    result = client.extract_entities_and_concepts(
+    result = gemini_client.extract_entities_and_concepts(
         transcript_data={"session_title": "Test", "agenda_items": []},
         prompt="Extract entities",
         response_schema={"type": "object", "properties": {"entities": {"type": "array"}}},
     )
 
     assert result == parsed_payload
+
+
+def test_extract_usage_accepts_dicts_and_partial_objects(gemini_client):
+    """Usage given as a dict or with missing fields should still be read."""
+
+    from_dict = gemini_client._extract_usage(
+        SimpleNamespace(usage_metadata={"prompt_token_count": 5, "total_token_count": 7})
+    )
+    partial = gemini_client._extract_usage(
+        SimpleNamespace(usage_metadata=SimpleNamespace(candidates_token_count=3))
+    )
+
+    assert from_dict == gemini_module.TokenUsage(prompt_tokens=5, output_tokens=0, total_tokens=7)
+    assert partial == gemini_module.TokenUsage(prompt_tokens=0, output_tokens=3, total_tokens=0)
+    assert gemini_client._extract_usage(SimpleNamespace(usage_metadata={})) is None
+
+
+def test_usage_log_is_bounded(monkeypatch, make_gemini_client):
+    """Only the most recent usage records should be retained."""
+    monkeypatch.setattr(gemini_module.GeminiClient, "USAGE_LOG_MAXLEN", 2)
+    client = make_gemini_client()
+
+    for stage in ("a", "b", "c"):
+        response = SimpleNamespace(usage_metadata={"total_token_count": 1})
+        client._record_usage(response, stage=stage, duration_ms=1.0)
+
+    assert [record["stage"] for record in client.usage_log] == ["b", "c"]
+
+
+def test_usage_records_cached_tokens(gemini_client):
+    """Prompt tokens served from Gemini's context cache should be recorded."""
+
+    response = SimpleNamespace(
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=2000,
+            candidates_token_count=100,
+            total_token_count=2100,
+            cached_content_token_count=1500,
+        )
+    )
+    gemini_client._record_usage(response, stage="kg_extraction", duration_ms=10.0)
+
+    assert gemini_client.usage_log[0]["cached_tokens"] == 1500
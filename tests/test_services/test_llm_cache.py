@@ -0,0 +1,82 @@
+"""Tests for the Gemini response cache."""
+
+import asyncio
+
+from services import gemini as gemini_module
+from services.llm_cache import LLMCache
+
+SCHEMA = {"type": "object", "properties": {"answer": {"type": "integer"}}}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Entries written by one cache should be readable by a fresh one."""
+    key = LLMCache.make_key({"prompt": "hello"})
+    LLMCache(tmp_path).set(key, {"answer": 42})
+
+    cache = LLMCache(tmp_path)
+    assert cache.get(key) == {"answer": 42}
+    assert cache.get(LLMCache.make_key({"prompt": "other"})) is None
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_cached_values_are_not_shared(tmp_path):
+    """Mutating a stored or returned value must not change later hits."""
+    key = LLMCache.make_key({"prompt": "hello"})
+    cache = LLMCache(tmp_path)
+    value = {"aliases": ["the Bill"]}
+    cache.set(key, value)
+    value["aliases"].append("set")
+
+    hit = cache.get(key)
+    hit["aliases"].append("get")
+
+    assert cache.get(key) == {"aliases": ["the Bill"]}
+
+
+def test_generate_structured_served_from_cache(make_gemini_client, tmp_path):
+    """Repeated deterministic requests should only hit the API once."""
+    client = make_gemini_client(cache=LLMCache(tmp_path))
+    client.client.models.response.parsed = {"answer": 42}
+    first = client.generate_structured("prompt", SCHEMA)
+    second = client.generate_structured("prompt", SCHEMA)
+
+    assert first == second == {"answer": 42}
+    assert client.client.models.generate_calls == 1
+
+
+def test_cache_hits_skip_rate_limiter(monkeypatch, make_gemini_client, tmp_path):
+    """Only requests that miss the cache should wait on the rate limiter."""
+    waits = []
+    monkeypatch.setattr(gemini_module._rate_limiter, "wait_if_needed", lambda: waits.append(1))
+
+    async def async_wait() -> None:
+        waits.append(1)
+
+    monkeypatch.setattr(gemini_module._rate_limiter, "async_wait_if_needed", async_wait)
+
+    client = make_gemini_client(cache=LLMCache(tmp_path))
+    for _ in range(100):
+        client.generate_structured("prompt", SCHEMA)
+        asyncio.run(client.agenerate_structured("prompt", SCHEMA))
+
+    assert client.client.models.generate_calls == 1
+    assert len(waits) == 1
+
+
+def test_cache_skipped_for_nonzero_temperature(make_gemini_client, tmp_path):
+    """Sampled generations should never be served from the cache."""
+    client = make_gemini_client(temperature=0.7, cache=LLMCache(tmp_path))
+    client.generate_structured("prompt", SCHEMA)
+    client.generate_structured("prompt", SCHEMA)
+
+    assert client.client.models.generate_calls == 2
+
+
+def test_embeddings_cached_per_text(make_gemini_client, tmp_path):
+    """Only texts without a cached vector should be sent for embedding."""
+    client = make_gemini_client(cache=LLMCache(tmp_path))
+    client.embed_texts(["a", "bb"])
+    embeddings = client.embed_texts(["bb", "ccc", "a"])
+
+    assert client.client.models.embedded == ["a", "bb", "ccc"]
+    assert embeddings.tolist() == [[2.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
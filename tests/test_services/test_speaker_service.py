@@ -0,0 +1,78 @@
+"""Tests for canonical speaker matching."""
+
+import asyncio
+from types import SimpleNamespace
+
+from services.speaker_service import SpeakerService
+
+
+class FakeSession:
+    """Stub session returning a fixed speaker list and counting queries."""
+
+    def __init__(self, speakers: list) -> None:  # type: ignore[type-arg]
+        self.speakers = speakers
+        self.queries = 0
+
+    async def execute(self, statement):  # type: ignore[no-untyped-def]
+        self.queries += 1
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.speakers)))
+
+    def add(self, instance) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+
+def make_speaker(name: str, role: str | None = None):  # type: ignore[no-untyped-def]
+    return SimpleNamespace(name=name, role=role)
+
+
+def test_exact_match_ignores_leading_titles():
+    """Names equal after stripping titles should match without fuzzy scoring."""
+    speakers = [make_speaker("Jane Doe"), make_speaker("Hon. John Roe")]
+    session = FakeSession(speakers)
+    service = SpeakerService(session, threshold=90)  # type: ignore[arg-type]
+
+    assert asyncio.run(service._find_matching_speaker("The Hon. John Roe")) is speakers[1]
+    assert asyncio.run(service._find_matching_speaker("Dr. Jane Doe")) is speakers[0]
+    assert session.queries == 1
+
+
+def test_created_speakers_are_matched_without_reloading():
+    """A speaker created through the service should be found by later lookups."""
+    session = FakeSession([make_speaker("Jane Doe")])
+    service = SpeakerService(session, threshold=90)  # type: ignore[arg-type]
+
+    created = asyncio.run(service.get_or_create_speaker("Hon. John Roe", chamber="house"))
+    again = asyncio.run(service.get_or_create_speaker("John Roe"))
+
+    assert again is created
+    assert session.queries == 1
+
+
+def test_fuzzy_match_rejects_conflicting_roles():
+    """Close names should not match when both speakers' roles clearly differ."""
+    speakers = [make_speaker("Jane Doe", role="Minister of Finance")]
+    service = SpeakerService(FakeSession(speakers), threshold=80)  # type: ignore[arg-type]
+
+    match = asyncio.run(service._find_matching_speaker("Jane Doee", "MINISTER OF FINANCE"))
+    assert match is speakers[0]
+    assert asyncio.run(service._find_matching_speaker("Jane Doee", "Clerk of Parliament")) is None
+
+
+def test_normalize_name_strips_titles_and_punctuation():
+    """Normalization should drop leading titles, punctuation and extra whitespace."""
+    service = SpeakerService(FakeSession([]), threshold=90)  # type: ignore[arg-type]
+
+    assert service._normalize_name("  The Hon.  Jane   O'Neal-Doe, K.C. ") == "jane oneal-doe kc"
+    assert service._normalize_name("Senator Dr. John Roe") == "dr john roe"
+
+
+def test_title_only_names_do_not_match():
+    """Names that normalize to nothing should not match each other exactly or fuzzily."""
+    speakers = [make_speaker("Hon.")]
+    service = SpeakerService(FakeSession(speakers), threshold=90)  # type: ignore[arg-type]
+
+    assert asyncio.run(service._find_matching_speaker("The Honourable")) is None
+    assert asyncio.run(service._find_matching_speaker("Dr.")) is None
@@ -0,0 +1,186 @@
+"""Tests for writing extracted knowledge graph records during ingestion."""
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+from models.entity import Entity
+from models.mention import Mention
+from models.relationship import Relationship
+from services.chunked_processor import ChunkEntity, ChunkRelationship
+from services.transcript_models import (
+    StructuredTranscript,
+    TranscriptAgendaItem,
+    TranscriptSentence,
+    TranscriptSpeechBlock,
+)
+from services.unified_ingestion import UnifiedIngestionPipeline
+
+
+class FakeSession:
+    """Stub session recording added instances and executed statements."""
+
+    def __init__(self, stored: list[Entity] | None = None) -> None:
+        self.stored = stored or []
+        self.statements: list = []  # type: ignore[type-arg]
+        self.added: list = []  # type: ignore[type-arg]
+
+    async def execute(self, statement):  # type: ignore[no-untyped-def]
+        self.statements.append(statement)
+        return SimpleNamespace(scalars=lambda: list(self.stored))
+
+    def add(self, instance) -> None:  # type: ignore[no-untyped-def]
+        self.added.append(instance)
+
+    async def flush(self) -> None:
+        pass
+
+    def added_of(self, model: type) -> list:  # type: ignore[type-arg]
+        return [instance for instance in self.added if isinstance(instance, model)]
+
+
+def make_transcript(agenda_items: int, sentences: int = 2) -> StructuredTranscript:
+    return StructuredTranscript(
+        session_title="Sitting",
+        session_date=date(2024, 1, 1),
+        chamber="house",
+        agenda_items=[
+            TranscriptAgendaItem(
+                topic_title=f"Item {idx}",
+                speech_blocks=[
+                    TranscriptSpeechBlock(
+                        speaker_name="Jane Doe",
+                        speaker_id="jane_doe",
+                        sentences=[
+                            TranscriptSentence(f"0m{i}s", f"Sentence {i}.")
+                            for i in range(sentences)
+                        ],
+                    )
+                ],
+            )
+            for idx in range(agenda_items)
+        ],
+    )
+
+
+def make_entity(entity_id: str, mentions: list[dict] | None = None) -> ChunkEntity:
+    return ChunkEntity(
+        entity_id=entity_id,
+        entity_type="law",
+        name=entity_id,
+        canonical_name=entity_id,
+        mentions=mentions if mentions is not None else [{"sentence_index": 0}],
+    )
+
+
+def make_relationship(source_id: str, target_id: str, sentence_index: int = 0) -> ChunkRelationship:
+    return ChunkRelationship(
+        source_id=source_id,
+        target_id=target_id,
+        relation_type="supports",
+        sentiment="positive",
+        evidence="I support this.",
+        evidence_sentence_index=sentence_index,
+    )
+
+
+def make_pipeline(session: FakeSession, extractions: dict) -> UnifiedIngestionPipeline:  # type: ignore[type-arg]
+    """Build a pipeline whose extraction returns extractions[agenda title]."""
+    pipeline = UnifiedIngestionPipeline(session, gemini_client=None)  # type: ignore[arg-type]
+
+    async def aprocess_transcript(agenda_item_title: str, speech_blocks: list):  # type: ignore[no-untyped-def,type-arg]
+        return extractions[agenda_item_title]
+
+    pipeline.chunked_processor = SimpleNamespace(aprocess_transcript=aprocess_transcript)  # type: ignore[assignment]
+    return pipeline
+
+
+def test_entities_prefetched_once_per_agenda_item():
+    """Each agenda item should load its stored entities with a single WHERE IN query."""
+    stored = Entity(entity_id="bill_a", name="bill_a", canonical_name="bill_a", aliases=[])
+    session = FakeSession([stored])
+    pipeline = make_pipeline(
+        session,
+        {
+            "Item 0": (
+                [make_entity("bill_a"), make_entity("bill_b")],
+                [make_relationship("bill_a", "bill_b")],
+            ),
+            "Item 1": (
+                [make_entity("bill_a"), make_entity("bill_c")],
+                [make_relationship("bill_c", "bill_a")],
+            ),
+        },
+    )
+
+    stats = asyncio.run(pipeline._extract_knowledge_graph(make_transcript(2), "s1", "v1"))
+
+    assert len(session.statements) == 2
+    assert all("entity_id IN" in str(statement) for statement in session.statements)
+    assert [e.entity_id for e in session.added_of(Entity)] == ["bill_b", "bill_c"]
+    assert stats == {"entities": 4, "relationships": 2, "mentions": 4}
+
+
+def test_placeholder_entity_reused_by_later_agenda_items():
+    """A placeholder created for one agenda item should not be inserted again for the next."""
+    session = FakeSession()
+    pipeline = make_pipeline(
+        session,
+        {
+            "Item 0": ([make_entity("bill_a")], [make_relationship("bill_a", "org_x")]),
+            "Item 1": ([make_entity("bill_b")], [make_relationship("bill_b", "org_x")]),
+        },
+    )
+
+    asyncio.run(pipeline._extract_knowledge_graph(make_transcript(2), "s1", "v1"))
+
+    # Item 0 queries its entities and then the unknown endpoint; item 1 only its entities
+    assert len(session.statements) == 3
+    placeholders = [e for e in session.added_of(Entity) if e.entity_id == "org_x"]
+    assert len(placeholders) == 1
+    assert placeholders[0].entity_type == "unknown"
+    assert len(session.added_of(Relationship)) == 2
+
+
+def test_invalid_sentence_indexes_create_no_mentions():
+    """Out-of-range or non-integer sentence indexes should be skipped."""
+    session = FakeSession()
+    mentions = [
+        {"sentence_index": 1},
+        {"sentence_index": 2},
+        {"sentence_index": -1},
+        {"sentence_index": "0"},
+        {"sentence_index": None},
+    ]
+    pipeline = make_pipeline(
+        session,
+        {"Item 0": ([make_entity("bill_a", mentions)], [make_relationship("bill_a", "bill_a", 5)])},
+    )
+
+    asyncio.run(pipeline._extract_knowledge_graph(make_transcript(1), "s1", "v1"))
+
+    assert [m.sentence_index for m in session.added_of(Mention)] == [1]
+    assert session.added_of(Relationship) == []
+
+
+def test_results_stored_in_agenda_order():
+    """Extractions finishing out of order should still be stored in agenda order."""
+    session = FakeSession()
+    pipeline = UnifiedIngestionPipeline(session, gemini_client=None)  # type: ignore[arg-type]
+    finished: list[str] = []
+
+    async def aprocess_transcript(agenda_item_title: str, speech_blocks: list):  # type: ignore[no-untyped-def,type-arg]
+        # Earlier agenda items take longer, so they complete last
+        await asyncio.sleep(0.03 if agenda_item_title == "Item 0" else 0.0)
+        finished.append(agenda_item_title)
+        entity_id = f"bill_{agenda_item_title[-1]}"
+        return [make_entity(entity_id)], [make_relationship(entity_id, entity_id)]
+
+    pipeline.chunked_processor = SimpleNamespace(aprocess_transcript=aprocess_transcript)  # type: ignore[assignment]
+
+    asyncio.run(pipeline._extract_knowledge_graph(make_transcript(3), "s1", "v1"))
+
+    assert finished[-1] == "Item 0"
+    assert [e.entity_id for e in session.added_of(Entity)] == ["bill_0", "bill_1", "bill_2"]
+    assert [m.agenda_item_index for m in session.added_of(Mention)] == [0, 1, 2]
+    assert [r.agenda_item_index for r in session.added_of(Relationship)] == [0, 1, 2]